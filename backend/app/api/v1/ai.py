@@ -5,6 +5,7 @@ from typing import AsyncGenerator, Optional
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
 from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
@@ -118,6 +119,7 @@ async def stream_chat_response(
     chat_file_ids: Optional[list[str]] = None,
     parent_id: Optional[str] = None,
     project_id: Optional[int] = None,
+    template_parts: Optional[list[str]] = None,
 ) -> AsyncGenerator[str, None]:
     """Stream chat response as NDJSON.
 
@@ -129,6 +131,7 @@ async def stream_chat_response(
         chat_file_ids: IDs of attached files
         parent_id: Parent message ID for multi-turn
         project_id: Optional project ID (for DeepResearch etc.)
+        template_parts: System prompt in chunks (overrides template)
     """
     ask_service = get_ask_service()
 
@@ -141,6 +144,7 @@ async def stream_chat_response(
             chat_file_ids=chat_file_ids,
             parent_id=parent_id,
             project_id=project_id,
+            template_parts=template_parts,
         ):
             yield json.dumps(event.model_dump(by_alias=True)) + "\n"
     except AskAPIError as e:
@@ -686,15 +690,10 @@ async def ask_project_question(
             status_code=503, detail="AI service is not enabled"
         )
 
-    # Verify project exists and build context
-    project = project_service.get_project(request.project_id)
-    context = project_service.build_ai_context(request.project_id)
-
-    template = f"""あなたは「{project.name}」プロジェクトのナレッジアシスタントです。
-以下のプロジェクト関連ノートの内容を基に、ユーザーの質問に回答してください。
-回答は正確かつ簡潔に行い、ノートに記載されていない情報については推測であることを明示してください。
-
-{context}"""
+    # Verify project exists and build context off the event loop
+    template_parts = await run_in_threadpool(
+        project_service.build_prompt_parts, request.project_id
+    )
 
     chat_id = str(request.chat_id) if request.chat_id else None
 
@@ -702,7 +701,7 @@ async def ask_project_question(
         stream_chat_response(
             user_input=request.question,
             chat_id=chat_id,
-            template=template,
+            template_parts=template_parts,
             chat_file_ids=request.file_ids,
             parent_id=request.parent_id,
         ),
@@ -106,17 +106,17 @@ async def download_file(
     service: FileService = Depends(get_file_service),
 ) -> Response:
     """ファイルをダウンロード"""
-    content, filename, content_type = service.download_file(file_id)
+    chunks, filename, content_type, size = service.iter_download_file(file_id)
 
     # Encode filename for Content-Disposition header
     encoded_filename = filename.encode("utf-8").decode("latin-1", errors="replace")
 
-    return Response(
-        content=content,
+    return StreamingResponse(
+        chunks,
         media_type=content_type,
         headers={
             "Content-Disposition": f'attachment; filename="{encoded_filename}"',
-            "Content-Length": str(len(content)),
+            "Content-Length": str(size),
         },
     )
 
@@ -127,13 +127,13 @@ async def preview_file(
     service: FileService = Depends(get_file_service),
 ) -> Response:
     """ファイルをプレビュー表示用に取得（画像・PDF）"""
-    content, filename, content_type = service.download_file(file_id)
+    chunks, filename, content_type, _ = service.iter_download_file(file_id)
 
     # RFC 5987 encoding for non-ASCII filenames
     encoded_filename = quote(filename, safe="")
 
-    return Response(
-        content=content,
+    return StreamingResponse(
+        chunks,
         media_type=content_type,
         headers={
             "Content-Disposition": f"inline; filename*=UTF-8''{encoded_filename}",
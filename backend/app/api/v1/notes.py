@@ -520,15 +520,15 @@ def get_note_versions(
     service: NoteService = Depends(get_note_service),
 ) -> List[NoteVersionBrief]:
     """ノートのバージョン履歴を取得"""
-    versions = service.get_versions(note_id)
+    versions = service.get_version_metadata(note_id)
     return [
         NoteVersionBrief(
-            id=v.id,
-            version_no=v.version_no,
-            title=v.title,
-            created_at=v.created_at,
+            id=version_id,
+            version_no=version_no,
+            title=title,
+            created_at=created_at,
         )
-        for v in versions
+        for version_id, version_no, title, created_at in versions
     ]
 
 
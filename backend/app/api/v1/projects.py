@@ -37,10 +37,7 @@ def get_projects(
     """
     if company_id is not None:
         projects = service.get_projects_by_company(company_id)
-        result = []
-        for project in projects:
-            result.append(service.get_project_response(project.id))
-        return result
+        return service.get_project_responses(projects)
     return service.get_all_projects_with_count()
 
 
@@ -77,10 +74,7 @@ def search_projects(
         List of matching projects.
     """
     projects = service.search_projects(q)
-    result = []
-    for project in projects:
-        result.append(service.get_project_response(project.id))
-    return result
+    return service.get_project_responses(projects)
 
 
 @router.get("/projects/{project_id}", response_model=ProjectResponse)
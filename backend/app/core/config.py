@@ -16,6 +16,8 @@ class Settings(BaseSettings):
     db_user: str = "notedock"
     db_password: str = "notedock"
     db_name: str = "notedock"
+    # Compiled SQL statements cached per engine (SQLAlchemy query_cache_size)
+    db_query_cache_size: int = 1200
 
     # MinIO
     minio_endpoint: str = "http://localhost:9000"
@@ -0,0 +1,32 @@
+"""Add partial index on notes.editing_locked_at
+
+Revision ID: 011_add_editing_lock_index
+Revises: 010_add_template_sort_order
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "011_add_editing_lock_index"
+down_revision: Union[str, None] = "010_add_template_sort_order"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Partial index used by the expired edit lock sweep
+    op.create_index(
+        "ix_notes_editing_locked_at",
+        "notes",
+        ["editing_locked_at"],
+        postgresql_where=sa.text("editing_locked_at IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_notes_editing_locked_at", table_name="notes")
@@ -10,6 +10,7 @@ engine = create_engine(
     settings.database_url,
     echo=settings.app_debug,
     pool_pre_ping=True,
+    query_cache_size=settings.db_query_cache_size,
 )
 
 SessionLocal = sessionmaker(
@@ -1,4 +1,4 @@
-from sqlalchemy import String, Integer, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import String, Integer, Text, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from typing import Optional, List, TYPE_CHECKING
@@ -116,6 +116,17 @@ class Note(Base, TimestampMixin):
         cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        # Partial index for the expired edit lock sweep; only locked notes
+        # are indexed.
+        Index(
+            "ix_notes_editing_locked_at",
+            "editing_locked_at",
+            postgresql_where=editing_locked_at.is_not(None),
+            sqlite_where=editing_locked_at.is_not(None),
+        ),
+    )
+
     @property
     def is_deleted(self) -> bool:
         """Check if note is soft-deleted."""
@@ -57,8 +57,8 @@ class CompanyRepository:
     def get_project_count(self, company_id: int) -> int:
         """Get the number of projects for a company."""
         stmt = (
-            select(func.count(Project.id))
+            select(func.count())
+            .select_from(Project)
             .where(Project.company_id == company_id)
         )
-        result = self.db.execute(stmt)
-        return result.scalar() or 0
+        return self.db.execute(stmt).scalar_one()
@@ -108,8 +108,7 @@ class FolderRepository:
     def get_all_descendant_ids(self, folder_id: int) -> List[int]:
         """Get all descendant folder IDs including the folder itself.
 
-        Recursively collects IDs of the specified folder and all
-        its subfolders.
+        Collects IDs of the specified folder and all its subfolders.
 
         Args:
             folder_id: The ID of the root folder.
@@ -118,8 +117,30 @@ class FolderRepository:
             List of folder IDs including the specified folder
             and all descendants.
         """
-        result = [folder_id]
-        children = self.get_children(folder_id)
-        for child in children:
-            result.extend(self.get_all_descendant_ids(child.id))
-        return result
+        return self.get_all_descendant_ids_for_roots([folder_id])
+
+    def get_all_descendant_ids_for_roots(self, root_ids: List[int]) -> List[int]:
+        """Get the IDs of several folders and all their descendants.
+
+        Walks the whole hierarchy in a single recursive CTE query.
+
+        Args:
+            root_ids: IDs of the folders to start from.
+
+        Returns:
+            List of unique folder IDs of the roots and their descendants.
+        """
+        if not root_ids:
+            return []
+        tree = (
+            select(Folder.id)
+            .where(Folder.id.in_(root_ids))
+            .cte(name="folder_tree", recursive=True)
+        )
+        # UNION (not UNION ALL) drops duplicates, so overlapping roots
+        # are visited once
+        tree = tree.union(
+            select(Folder.id).where(Folder.parent_id == tree.c.id)
+        )
+        result = self.db.execute(select(tree.c.id))
+        return list(result.scalars().all())
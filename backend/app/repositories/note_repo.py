@@ -1,9 +1,10 @@
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import select, func, or_, and_
-from typing import Any, Optional, List, Tuple
+from sqlalchemy import select, delete, update, func, or_, and_
+from sqlalchemy.engine import CursorResult
+from typing import Any, Optional, List, Tuple, cast
 from datetime import datetime
 
-from app.models import Note, Tag, Folder, Project
+from app.models import Note, NoteVersion, Tag, Folder, Project
 from app.db.base import now_jst
 
 
@@ -31,6 +32,16 @@ class NoteRepository:
         result = self.db.execute(query)
         return result.unique().scalar_one_or_none()
 
+    def get_by_ids(self, note_ids: List[int]) -> List[Note]:
+        """Get non-deleted notes by IDs in one query."""
+        if not note_ids:
+            return []
+        query = select(Note).where(
+            Note.id.in_(note_ids), Note.deleted_at.is_(None)
+        )
+        result = self.db.execute(query)
+        return list(result.scalars().all())
+
     def get_list(
         self,
         page: int = 1,
@@ -152,8 +163,13 @@ class NoteRepository:
         tags: Optional[List[Tag]] = None,
         created_by: Optional[str] = None,
         updated_by: Optional[str] = None,
+        commit: bool = True,
     ) -> Note:
-        """Create a new note."""
+        """Create a new note.
+
+        With commit=False the note is only flushed (so it has an id) and
+        the caller is responsible for committing.
+        """
         note = Note(
             title=title,
             content_md=content_md,
@@ -170,17 +186,27 @@ class NoteRepository:
             note.tags = tags
 
         self.db.add(note)
+        if not commit:
+            self.db.flush()
+            return note
         self.db.commit()
         self.db.refresh(note)
         return note
 
-    def update(self, note: Note, **kwargs: Any) -> Note:
-        """Update a note."""
+    def update(self, note: Note, commit: bool = True, **kwargs: Any) -> Note:
+        """Update a note.
+
+        With commit=False the changes are only flushed and the caller is
+        responsible for committing.
+        """
         for key, value in kwargs.items():
             if hasattr(note, key):
                 setattr(note, key, value)
 
         note.updated_at = now_jst()
+        if not commit:
+            self.db.flush()
+            return note
         self.db.commit()
         self.db.refresh(note)
         return note
@@ -204,8 +230,12 @@ class NoteRepository:
         self.db.delete(note)
         self.db.commit()
 
-    def duplicate(self, note: Note) -> Note:
-        """Duplicate a note."""
+    def duplicate(self, note: Note, commit: bool = True) -> Note:
+        """Duplicate a note.
+
+        With commit=False the copy is only flushed (so it has an id) and
+        the caller is responsible for committing.
+        """
         new_note = Note(
             title=f"{note.title} (コピー)",
             content_md=note.content_md,
@@ -221,10 +251,166 @@ class NoteRepository:
         new_note.files = list(note.files)
 
         self.db.add(new_note)
+        if not commit:
+            self.db.flush()
+            return new_note
         self.db.commit()
         self.db.refresh(new_note)
         return new_note
 
+    def try_acquire_lock(
+        self,
+        note_id: int,
+        locked_by: str,
+        expired_before: datetime,
+        force: bool = False,
+    ) -> bool:
+        """Atomically take the edit lock on a note.
+
+        The lock is taken with a single conditional UPDATE, so two users
+        can never both observe "unlocked" and claim it.
+
+        Args:
+            note_id: Note ID.
+            locked_by: Display name or session ID of the user.
+            expired_before: Locks taken before this time count as expired.
+            force: If True, take the lock regardless of the current holder.
+
+        Returns:
+            True if the lock was acquired, False otherwise (including when
+            the note does not exist).
+        """
+        stmt = update(Note).where(
+            Note.id == note_id,
+            Note.deleted_at.is_(None),
+        )
+        if not force:
+            stmt = stmt.where(
+                or_(
+                    Note.editing_locked_by.is_(None),
+                    Note.editing_locked_at.is_(None),
+                    Note.editing_locked_at < expired_before,
+                    Note.editing_locked_by == locked_by,
+                )
+            )
+        stmt = stmt.values(
+            editing_locked_by=locked_by,
+            editing_locked_at=now_jst(),
+        ).execution_options(synchronize_session=False)
+
+        result = cast(CursorResult[Any], self.db.execute(stmt))
+        self.db.commit()
+        return result.rowcount == 1
+
+    def try_refresh_lock(self, note_id: int, locked_by: str) -> bool:
+        """Extend the edit lock if it is held by ``locked_by``.
+
+        Returns:
+            True if the lock was refreshed, False otherwise.
+        """
+        stmt = (
+            update(Note)
+            .where(
+                Note.id == note_id,
+                Note.deleted_at.is_(None),
+                Note.editing_locked_by == locked_by,
+            )
+            .values(editing_locked_at=now_jst())
+            .execution_options(synchronize_session=False)
+        )
+        result = cast(CursorResult[Any], self.db.execute(stmt))
+        self.db.commit()
+        return result.rowcount == 1
+
+    def sweep_expired_locks(self, timeout_minutes: int) -> int:
+        """Clear edit locks taken more than ``timeout_minutes`` ago.
+
+        Returns:
+            Number of notes whose lock was released.
+        """
+        from datetime import timedelta
+        cutoff = now_jst() - timedelta(minutes=timeout_minutes)
+
+        stmt = (
+            update(Note)
+            .where(Note.editing_locked_at < cutoff)
+            .values(editing_locked_by=None, editing_locked_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        result = cast(CursorResult[Any], self.db.execute(stmt))
+        self.db.commit()
+        return result.rowcount
+
+    def list_version_metadata(
+        self, note_id: int
+    ) -> List[Tuple[int, int, str, datetime]]:
+        """Get version metadata for a note without loading content.
+
+        Returns:
+            List of (id, version_no, title, created_at), newest first.
+        """
+        stmt = (
+            select(
+                NoteVersion.id,
+                NoteVersion.version_no,
+                NoteVersion.title,
+                NoteVersion.created_at,
+            )
+            .where(NoteVersion.note_id == note_id)
+            .order_by(NoteVersion.version_no.desc())
+        )
+        result = self.db.execute(stmt)
+        return [
+            (version_id, version_no, title, created_at)
+            for version_id, version_no, title, created_at in result
+        ]
+
+    def get_version(
+        self, note_id: int, version_no: int
+    ) -> Optional[NoteVersion]:
+        """Get a specific version of a note."""
+        stmt = select(NoteVersion).where(
+            NoteVersion.note_id == note_id,
+            NoteVersion.version_no == version_no,
+        )
+        return self.db.execute(stmt).scalar_one_or_none()
+
+    def get_max_version_no(self, note_id: int) -> int:
+        """Get the latest version number of a note (0 if it has none)."""
+        stmt = select(func.max(NoteVersion.version_no)).where(
+            NoteVersion.note_id == note_id
+        )
+        return self.db.execute(stmt).scalar() or 0
+
+    def prune_versions(
+        self,
+        note_id: int,
+        latest_version_no: int,
+        keep: int,
+        commit: bool = True,
+    ) -> None:
+        """Delete all but the newest ``keep`` versions of a note.
+
+        Issued as a single DELETE keyed by a version_no threshold, so no
+        version rows are loaded into the session.
+
+        Args:
+            note_id: Note ID.
+            latest_version_no: Version number of the newest version.
+            keep: Number of versions to keep.
+            commit: Whether to commit after deleting.
+        """
+        threshold = latest_version_no - keep
+        if threshold <= 0:
+            return
+        stmt = delete(NoteVersion).where(
+            NoteVersion.note_id == note_id,
+            NoteVersion.version_no <= threshold,
+        )
+        self.db.execute(stmt)
+        if commit:
+            self.db.commit()
+
     def get_by_project(
         self,
         project_id: int,
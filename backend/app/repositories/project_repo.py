@@ -1,7 +1,8 @@
 """Repository for Project database operations."""
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import select, func
-from typing import Any, Optional, List
+from sqlalchemy import select, func, and_, or_
+from datetime import datetime
+from typing import Any, Dict, Optional, List, Tuple
 
 from app.models.project import Project
 from app.models.company import Company
@@ -26,6 +27,14 @@ class ProjectRepository:
         """Get a project by ID."""
         return self.db.get(Project, project_id)
 
+    def get_by_ids(self, project_ids: List[int]) -> List[Project]:
+        """Get projects by IDs in one query."""
+        if not project_ids:
+            return []
+        query = select(Project).where(Project.id.in_(project_ids))
+        result = self.db.execute(query)
+        return list(result.scalars().all())
+
     def get_all(self) -> List[Project]:
         """Get all projects ordered by name."""
         query = select(Project).order_by(Project.name)
@@ -79,11 +88,42 @@ class ProjectRepository:
     def get_note_count(self, project_id: int) -> int:
         """Get the number of notes for a project."""
         stmt = (
-            select(func.count(Note.id))
+            select(func.count())
+            .select_from(Note)
             .where(Note.project_id == project_id)
         )
+        return self.db.execute(stmt).scalar_one()
+
+    def list_with_counts(
+        self,
+    ) -> List[Tuple[Project, Optional[Company], int, int]]:
+        """Get all projects with their company and aggregate counts.
+
+        Returns:
+            Rows of (project, company, note_count, company_project_count)
+            ordered by project name. company is None for projects without
+            a company.
+        """
+        stmt = (
+            select(
+                Project,
+                Company,
+                func.count(Note.id).label("note_count"),
+                func.count(Project.id)
+                .over(partition_by=Project.company_id)
+                .label("company_project_count"),
+            )
+            .outerjoin(Company, Project.company_id == Company.id)
+            .outerjoin(Note, Note.project_id == Project.id)
+            .group_by(Project.id, Company.id)
+            .order_by(Project.name)
+        )
         result = self.db.execute(stmt)
-        return result.scalar() or 0
+        return [
+            (project, company, note_count, company_project_count)
+            for project, company, note_count, company_project_count
+            in result
+        ]
 
     def get_notes(self, project_id: int, include_deleted: bool = False) -> List[Note]:
         """Get all notes for a project.
@@ -105,6 +145,74 @@ class ProjectRepository:
         result = self.db.execute(stmt)
         return list(result.scalars().all())
 
+    def get_notes_by_titles(
+        self, project_ids: List[int], titles: List[str]
+    ) -> List[Note]:
+        """Get non-deleted notes of several projects whose title is in titles.
+
+        Args:
+            project_ids: Project IDs.
+            titles: Note titles to match.
+
+        Returns:
+            Matching notes, most recently updated first.
+        """
+        if not project_ids or not titles:
+            return []
+        stmt = (
+            select(Note)
+            .where(
+                Note.project_id.in_(project_ids),
+                Note.title.in_(titles),
+                Note.deleted_at.is_(None),
+            )
+            .order_by(Note.updated_at.desc())
+        )
+        result = self.db.execute(stmt)
+        return list(result.scalars().all())
+
+    def get_note_stats(self, project_id: int) -> Tuple[int, Optional[datetime]]:
+        """Get the note count and latest updated_at for a project.
+
+        Soft-deleted notes are excluded.
+
+        Returns:
+            Tuple of (note_count, max_updated_at).
+        """
+        stmt = select(func.count(Note.id), func.max(Note.updated_at)).where(
+            Note.project_id == project_id,
+            Note.deleted_at.is_(None),
+        )
+        note_count, max_updated_at = self.db.execute(stmt).one()
+        return note_count or 0, max_updated_at
+
+    def get_note_contents(
+        self, project_id: int, limit: int
+    ) -> List[Tuple[str, str]]:
+        """Get (title, content_md) of the most recently updated notes.
+
+        Selects only the two columns instead of full Note entities, for
+        callers that just need the text (e.g. AI context building).
+
+        Args:
+            project_id: Project ID.
+            limit: Maximum number of notes to return.
+
+        Returns:
+            List of (title, content_md) tuples, newest first.
+        """
+        stmt = (
+            select(Note.title, Note.content_md)
+            .where(
+                Note.project_id == project_id,
+                Note.deleted_at.is_(None),
+            )
+            .order_by(Note.updated_at.desc())
+            .limit(limit)
+        )
+        result = self.db.execute(stmt)
+        return [(title, content_md) for title, content_md in result]
+
     def find_by_company_and_name(
         self,
         company_name: str,
@@ -130,6 +238,34 @@ class ProjectRepository:
         result = self.db.execute(stmt)
         return result.scalar_one_or_none()
 
+    def find_by_company_and_names(
+        self,
+        names: List[Tuple[str, str]],
+    ) -> Dict[Tuple[str, str], Project]:
+        """Find several projects by company name and project name at once.
+
+        Args:
+            names: (company_name, project_name) pairs.
+
+        Returns:
+            Dictionary mapping each found pair to its project.
+        """
+        if not names:
+            return {}
+        stmt = (
+            select(Company.name, Project)
+            .join(Company, Project.company_id == Company.id)
+            .where(or_(*(
+                and_(Company.name == company_name, Project.name == project_name)
+                for company_name, project_name in names
+            )))
+        )
+        result = self.db.execute(stmt)
+        return {
+            (company_name, project.name): project
+            for company_name, project in result
+        }
+
     def find_by_name_only(self, project_name: str) -> Optional[Project]:
         """Find a project by name only (for projects without company).
 
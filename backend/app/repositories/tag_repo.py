@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import select
-from typing import Optional, List
+from sqlalchemy import select, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import Any, Dict, Optional, List
 
 from app.models import Tag
 
@@ -34,12 +36,46 @@ class TagRepository:
         return tag
 
     def get_or_create_many(self, names: List[str]) -> List[Tag]:
-        """Get or create multiple tags."""
-        tags = []
-        for name in names:
-            if name.strip():
-                tags.append(self.get_or_create(name.strip()))
-        return tags
+        """Get or create multiple tags in one batch.
+
+        Existing tags are loaded with a single SELECT and the missing ones
+        are inserted with a single INSERT that skips names created
+        concurrently. Tags are returned in the order of names.
+        """
+        stripped = (name.strip() for name in names)
+        unique_names = list(dict.fromkeys(name for name in stripped if name))
+        if not unique_names:
+            return []
+
+        tags_by_name = self._get_by_names(unique_names)
+        missing = [name for name in unique_names if name not in tags_by_name]
+        if missing:
+            self.db.execute(self._insert_ignoring_conflicts(
+                [{"name": name} for name in missing]
+            ))
+            self.db.commit()
+            tags_by_name.update(self._get_by_names(missing))
+
+        return [tags_by_name[name] for name in unique_names]
+
+    def _get_by_names(self, names: List[str]) -> Dict[str, Tag]:
+        """Get tags by name, keyed by name."""
+        query = select(Tag).where(Tag.name.in_(names))
+        result = self.db.execute(query)
+        return {tag.name: tag for tag in result.scalars().all()}
+
+    def _insert_ignoring_conflicts(self, rows: List[Dict[str, Any]]) -> Any:
+        """Build a bulk tag INSERT that ignores duplicate names."""
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            return pg_insert(Tag).values(rows).on_conflict_do_nothing(
+                index_elements=[Tag.name]
+            )
+        if dialect == "sqlite":
+            return sqlite_insert(Tag).values(rows).on_conflict_do_nothing(
+                index_elements=[Tag.name]
+            )
+        return insert(Tag).values(rows)
 
     def get_all(self) -> List[Tag]:
         """Get all tags."""
@@ -6,6 +6,7 @@ This script performs maintenance tasks:
 - Permanently deletes notes in trash for more than 30 days
 - Removes old version history (beyond 50 versions, older than 1 year)
 - Cleans up orphaned files from MinIO
+- Releases expired note edit locks
 
 Usage:
     poetry run python -m app.scripts.run_cleanup
@@ -36,6 +37,7 @@ def main() -> None:
         print(f"Deleted notes (from trash):     {results['deleted_notes']}")
         print(f"Deleted old versions:           {results['deleted_versions']}")
         print(f"Deleted orphaned files:         {results['deleted_files']}")
+        print(f"Released expired locks:         {results['released_locks']}")
         print("=" * 50 + "\n")
 
         log_info("Cleanup job completed successfully")
@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+"""
+Edit lock sweep script for NoteDock.
+
+Releases note edit locks that have exceeded the lock timeout. Reads of the
+lock status only report expired locks as released, so this should run
+frequently (e.g. every 5 minutes via cron).
+
+Usage:
+    poetry run python -m app.scripts.run_lock_sweep
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.db.session import SessionLocal
+from app.repositories.note_repo import NoteRepository
+from app.services.note_service import EDIT_LOCK_TIMEOUT_MINUTES
+from app.core.logging import log_info, log_error
+
+
+def main() -> None:
+    """Run the edit lock sweep."""
+    db = SessionLocal()
+    try:
+        released = NoteRepository(db).sweep_expired_locks(EDIT_LOCK_TIMEOUT_MINUTES)
+        log_info(f"Released {released} expired edit locks")
+    except Exception as e:
+        log_error(f"Edit lock sweep failed: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
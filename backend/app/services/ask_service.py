@@ -2,7 +2,7 @@
 
 import json
 import uuid
-from typing import AsyncGenerator, Optional
+from typing import Any, AsyncGenerator, AsyncIterator, Iterable, Optional
 
 import httpx
 
@@ -48,6 +48,21 @@ class FileProcessingError(AskServiceError):
     pass
 
 
+async def _iter_json_body(
+    payload: dict[str, Any], template_parts: Iterable[str]
+) -> AsyncIterator[bytes]:
+    """Stream ``payload`` as a JSON body with a "template" built from parts.
+
+    Each part is JSON-escaped and written on its own, so the full template
+    is never materialized as one string.
+    """
+    head = json.dumps(payload, ensure_ascii=False)
+    yield (head[:-1] + ', "template": "').encode("utf-8")
+    for part in template_parts:
+        yield json.dumps(part, ensure_ascii=False)[1:-1].encode("utf-8")
+    yield b'"}'
+
+
 class AskService:
     """ASK API integration service.
 
@@ -389,6 +404,7 @@ class AskService:
         chat_file_ids: Optional[list[str]] = None,
         parent_id: Optional[str] = None,
         project_id: Optional[int] = None,
+        template_parts: Optional[Iterable[str]] = None,
     ) -> AsyncGenerator[StreamEvent, None]:
         """
         Send a chat message and stream the response.
@@ -401,6 +417,8 @@ class AskService:
             chat_file_ids: IDs of attached files
             parent_id: Parent message ID for multi-turn conversations
             project_id: Optional project ID (defaults to self.project_id)
+            template_parts: System prompt given as chunks; overrides template
+                and is streamed into the request body as-is
 
         Yields:
             StreamEvent objects as they arrive
@@ -422,12 +440,11 @@ class AskService:
 
         url = f"{self.base_url}/api/chat/?requireMessageId=True"
 
-        payload = {
+        payload: dict[str, Any] = {
             "action": "new",
             "projectId": effective_project_id,
             "chatId": chat_id,
             "userInput": user_input,
-            "template": template,
             "modelVariant": model_variant.value,
             "dataSourceItems": [],
             "chatFileIds": chat_file_ids or [],
@@ -436,6 +453,12 @@ class AskService:
             "useWebSearch": False,
             "isFollowUp": bool(parent_id),
         }
+        body: dict[str, Any]
+        if template_parts is not None:
+            body = {"content": _iter_json_body(payload, template_parts)}
+        else:
+            payload["template"] = template
+            body = {"json": payload}
 
         async with httpx.AsyncClient(timeout=None) as client:
             try:
@@ -443,7 +466,7 @@ class AskService:
                     "POST",
                     url,
                     headers=self._get_headers(),
-                    json=payload,
+                    **body,
                 ) as response:
                     if response.status_code != 200:
                         content = await response.aread()
@@ -10,6 +10,7 @@ from app.models import Note, NoteVersion, File
 from app.models.file import note_files
 from app.repositories.note_repo import NoteRepository
 from app.repositories.file_repo import FileRepository
+from app.services.note_service import EDIT_LOCK_TIMEOUT_MINUTES
 from app.utils.s3 import get_minio_client
 from app.core.logging import log_info, log_warning, log_error
 from app.db.base import now_jst
@@ -41,6 +42,7 @@ class CleanupService:
             "deleted_notes": 0,
             "deleted_versions": 0,
             "deleted_files": 0,
+            "released_locks": 0,
         }
 
         # 1. Clean up trash (notes deleted more than 30 days ago)
@@ -52,11 +54,15 @@ class CleanupService:
         # 3. Clean up orphaned files
         results["deleted_files"] = self.cleanup_orphaned_files()
 
+        # 4. Release expired edit locks
+        results["released_locks"] = self.release_expired_locks()
+
         log_info(
             f"Cleanup completed: "
             f"{results['deleted_notes']} notes, "
             f"{results['deleted_versions']} versions, "
-            f"{results['deleted_files']} files"
+            f"{results['deleted_files']} files, "
+            f"{results['released_locks']} locks"
         )
 
         return results
@@ -171,6 +177,20 @@ class CleanupService:
 
         return deleted_count
 
+    def release_expired_locks(self) -> int:
+        """
+        Release edit locks that have exceeded the lock timeout.
+
+        Returns:
+            Number of released locks.
+        """
+        released_count = self.note_repo.sweep_expired_locks(
+            EDIT_LOCK_TIMEOUT_MINUTES
+        )
+        if released_count > 0:
+            log_info(f"Released {released_count} expired edit locks")
+        return released_count
+
 
 def run_cleanup_job(db: Session) -> dict[str, int]:
     """
@@ -1,6 +1,6 @@
 from sqlalchemy.orm import Session
 from fastapi import UploadFile
-from typing import Optional, List, BinaryIO
+from typing import Optional, Iterator, List, BinaryIO
 import mimetypes
 
 from app.models import File, Note
@@ -116,6 +116,17 @@ class FileService:
         content = self.minio.download_file(file.stored_key)
         return content, file.original_name, file.mime_type
 
+    def iter_download_file(
+        self, file_id: int
+    ) -> tuple[Iterator[bytes], str, str, int]:
+        """Download a file in chunks.
+
+        Returns (chunks, filename, content_type, size).
+        """
+        file = self.get_file(file_id)
+        chunks = self.minio.iter_download(file.stored_key)
+        return chunks, file.original_name, file.mime_type, file.size_bytes
+
     def get_file_stream(self, file_id: int) -> tuple[BinaryIO, str, str]:
         """Get file stream for streaming response."""
         file = self.get_file(file_id)
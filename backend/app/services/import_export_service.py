@@ -89,24 +89,33 @@ class ImportExportService:
                 md_content = self._build_markdown_content(note)
                 zip_file.writestr(md_filename, md_content.encode("utf-8"))
 
-                # Export attached files
-                attachments: list[dict[str, str]] = []
-                for file in note.files:
-                    try:
-                        file_data = self.minio_client.download_file(file.stored_key)
-                        if file_data:
+                # Export attached files, downloaded concurrently and each
+                # written as soon as it arrives
+                note_files = note.files
+                files_by_key: dict[str, list[File]] = {}
+                for file in note_files:
+                    files_by_key.setdefault(file.stored_key, []).append(file)
+                exported_ids: set[int] = set()
+                for key, file_data in self.minio_client.iter_downloads(files_by_key):
+                    if not file_data:
+                        continue
+                    for file in files_by_key[key]:
+                        try:
                             attachment_path = (
                                 f"{note_dir}/attachments/{file.original_name}"
                             )
                             zip_file.writestr(attachment_path, file_data)
-                            attachments.append(
-                                {
-                                    "original_name": file.original_name,
-                                    "mime_type": file.mime_type,
-                                }
-                            )
-                    except Exception as e:
-                        log_warning(f"Failed to export attachment {file.id}: {e}")
+                            exported_ids.add(file.id)
+                        except Exception as e:
+                            log_warning(f"Failed to export attachment {file.id}: {e}")
+                attachments = [
+                    {
+                        "original_name": file.original_name,
+                        "mime_type": file.mime_type,
+                    }
+                    for file in note_files
+                    if file.id in exported_ids
+                ]
 
                 # Add note to manifest
                 manifest["notes"].append(
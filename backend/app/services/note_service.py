@@ -1,4 +1,4 @@
-from datetime import timedelta
+from datetime import datetime, timedelta
 
 from sqlalchemy.orm import Session
 from typing import Optional, List, Tuple
@@ -13,6 +13,13 @@ from app.db.base import now_jst
 
 MAX_VERSIONS = 50
 EDIT_LOCK_TIMEOUT_MINUTES = 30
+_LOCK_TIMEOUT = timedelta(minutes=EDIT_LOCK_TIMEOUT_MINUTES)
+
+
+def _normalize_tag_names(names: List[str]) -> List[str]:
+    """Strip tag names and drop blanks and duplicates, keeping order."""
+    stripped = (name.strip() for name in names if name)
+    return list(dict.fromkeys(name for name in stripped if name))
 
 
 class NoteService:
@@ -62,7 +69,9 @@ class NoteService:
     def create_note(self, data: NoteCreate) -> Note:
         """Create a new note."""
         # Get or create tags
-        tags = self.tag_repo.get_or_create_many(data.tag_names)
+        tags = self.tag_repo.get_or_create_many(
+            _normalize_tag_names(data.tag_names)
+        )
 
         note = self.note_repo.create(
             title=data.title,
@@ -76,10 +85,12 @@ class NoteService:
             tags=tags,
             created_by=data.created_by,
             updated_by=data.created_by,
+            commit=False,
         )
 
-        # Create initial version
-        self._create_version(note)
+        # Create initial version in the same transaction
+        self._create_initial_version(note)
+        self.db.commit()
 
         return note
 
@@ -94,14 +105,15 @@ class NoteService:
 
         # Handle tags separately
         if data.tag_names is not None:
-            tags = self.tag_repo.get_or_create_many(data.tag_names)
+            tags = self.tag_repo.get_or_create_many(
+                _normalize_tag_names(data.tag_names)
+            )
             note.tags = tags
 
-        # Update note
-        note = self.note_repo.update(note, **update_data)
-
-        # Create new version on save
-        self._create_version(note)
+        # Update note and create new version on save in one transaction
+        note = self.note_repo.update(note, commit=False, **update_data)
+        self._create_version(note, commit=False)
+        self.db.commit()
 
         return note
 
@@ -125,10 +137,11 @@ class NoteService:
     def duplicate_note(self, note_id: int) -> Note:
         """Duplicate a note."""
         note = self.get_note(note_id)
-        new_note = self.note_repo.duplicate(note)
+        new_note = self.note_repo.duplicate(note, commit=False)
 
-        # Create initial version for the new note
-        self._create_version(new_note)
+        # Create initial version for the new note in the same transaction
+        self._create_initial_version(new_note)
+        self.db.commit()
 
         return new_note
 
@@ -151,13 +164,30 @@ class NoteService:
             note, is_hidden_from_home=is_hidden_from_home
         )
 
-    def _create_version(self, note: Note) -> NoteVersion:
-        """Create a new version of the note."""
+    def _create_initial_version(self, note: Note) -> NoteVersion:
+        """Add version 1 of a note that was just created.
+
+        A new note has no versions yet, so the max version lookup and
+        pruning of _create_version are skipped. The caller commits.
+        """
+        version = NoteVersion(
+            note_id=note.id,
+            version_no=1,
+            title=note.title,
+            content_md=note.content_md,
+            cover_file_id=note.cover_file_id,
+        )
+        self.db.add(version)
+        return version
+
+    def _create_version(self, note: Note, commit: bool = True) -> NoteVersion:
+        """Create a new version of the note.
+
+        With commit=False the version insert and pruning are left in the
+        current transaction for the caller to commit.
+        """
         # Get current max version number
-        max_version = 0
-        for version in note.versions:
-            if version.version_no > max_version:
-                max_version = version.version_no
+        max_version = self.note_repo.get_max_version_no(note.id)
 
         new_version = NoteVersion(
             note_id=note.id,
@@ -167,34 +197,30 @@ class NoteService:
             cover_file_id=note.cover_file_id,
         )
         self.db.add(new_version)
-        self.db.commit()
 
         # Clean up old versions if exceeding max
-        self._cleanup_old_versions(note)
+        self.note_repo.prune_versions(
+            note.id, new_version.version_no, keep=MAX_VERSIONS, commit=False
+        )
+        if commit:
+            self.db.commit()
 
         return new_version
 
-    def _cleanup_old_versions(self, note: Note) -> None:
-        """Remove versions exceeding the maximum count."""
-        versions = sorted(note.versions, key=lambda v: v.version_no, reverse=True)
-
-        if len(versions) > MAX_VERSIONS:
-            for old_version in versions[MAX_VERSIONS:]:
-                self.db.delete(old_version)
-            self.db.commit()
-
-    def get_versions(self, note_id: int) -> List[NoteVersion]:
-        """Get all versions of a note."""
-        note = self.get_note(note_id)
-        return sorted(note.versions, key=lambda v: v.version_no, reverse=True)
+    def get_version_metadata(
+        self, note_id: int
+    ) -> List[Tuple[int, int, str, datetime]]:
+        """Get (id, version_no, title, created_at) of all versions of a note."""
+        self.get_note(note_id)
+        return self.note_repo.list_version_metadata(note_id)
 
     def get_version(self, note_id: int, version_no: int) -> NoteVersion:
         """Get a specific version of a note."""
-        note = self.get_note(note_id)
-        for version in note.versions:
-            if version.version_no == version_no:
-                return version
-        raise NotFoundError("バージョン", version_no)
+        self.get_note(note_id)
+        version = self.note_repo.get_version(note_id, version_no)
+        if not version:
+            raise NotFoundError("バージョン", version_no)
+        return version
 
     def restore_version(self, note_id: int, version_no: int) -> Note:
         """Restore a note to a specific version."""
@@ -209,11 +235,10 @@ class NoteService:
         note.content_md = version.content_md
         note.cover_file_id = version.cover_file_id
         note.updated_at = now_jst()
-        self.db.commit()
-        self.db.refresh(note)
 
-        # Create new version for the restore
-        self._create_version(note)
+        # Create new version for the restore in the same transaction
+        self._create_version(note, commit=False)
+        self.db.commit()
 
         return note
 
@@ -225,8 +250,7 @@ class NoteService:
         """Check if the edit lock has expired."""
         if not note.editing_locked_at:
             return True
-        timeout = timedelta(minutes=EDIT_LOCK_TIMEOUT_MINUTES)
-        return now_jst() > note.editing_locked_at + timeout
+        return now_jst() > note.editing_locked_at + _LOCK_TIMEOUT
 
     def check_edit_lock(self, note_id: int) -> dict:
         """
@@ -243,9 +267,9 @@ class NoteService:
         is_locked = bool(note.editing_locked_by and note.editing_locked_at)
         is_expired = self._is_lock_expired(note) if is_locked else False
 
-        # Auto-release expired lock
+        # Expired locks are reported as released without writing here;
+        # the cleanup job clears them (see sweep_expired_locks).
         if is_locked and is_expired:
-            self._clear_edit_lock(note)
             is_locked = False
 
         return {
@@ -272,33 +296,32 @@ class NoteService:
             - message: str
             - locked_by: str (current lock holder)
         """
-        note = self.get_note(note_id)
-
-        # Check existing lock
-        has_lock = bool(note.editing_locked_by and note.editing_locked_at)
-        is_expired = self._is_lock_expired(note) if has_lock else True
-
-        # Allow acquiring lock if: no lock, expired lock, same user, or force
-        same_user = note.editing_locked_by == locked_by
-        can_acquire = not has_lock or is_expired or same_user or force
-
-        if not can_acquire:
-            return {
-                "success": False,
-                "message": f"現在 {note.editing_locked_by} さんが編集中です",
-                "locked_by": note.editing_locked_by,
-            }
+        expired_before = now_jst() - _LOCK_TIMEOUT
+        # Retried once: the holder may release the lock between the
+        # failed attempt and reading who holds it.
+        for _ in range(2):
+            if self.note_repo.try_acquire_lock(
+                note_id, locked_by, expired_before, force=force
+            ):
+                return {
+                    "success": True,
+                    "message": "編集ロックを取得しました",
+                    "locked_by": locked_by,
+                }
 
-        # Set lock
-        note.editing_locked_by = locked_by
-        note.editing_locked_at = now_jst()
-        self.db.commit()
-        self.db.refresh(note)
+            # Lock is held by someone else (or the note does not exist)
+            note = self.get_note(note_id)
+            if note.editing_locked_by is not None:
+                return {
+                    "success": False,
+                    "message": f"現在 {note.editing_locked_by} さんが編集中です",
+                    "locked_by": note.editing_locked_by,
+                }
 
         return {
-            "success": True,
-            "message": "編集ロックを取得しました",
-            "locked_by": locked_by,
+            "success": False,
+            "message": "編集ロックを取得できませんでした。もう一度お試しください",
+            "locked_by": None,
         }
 
     def release_edit_lock(self, note_id: int, locked_by: str) -> dict:
@@ -344,17 +367,14 @@ class NoteService:
             - success: bool
             - message: str
         """
-        note = self.get_note(note_id)
-
-        if note.editing_locked_by != locked_by:
+        if not self.note_repo.try_refresh_lock(note_id, locked_by):
+            # Raise NotFoundError for missing notes, otherwise not the owner
+            self.get_note(note_id)
             return {
                 "success": False,
                 "message": "ロック所有者ではありません",
             }
 
-        note.editing_locked_at = now_jst()
-        self.db.commit()
-
         return {
             "success": True,
             "message": "編集ロックを更新しました",
@@ -365,7 +385,6 @@ class NoteService:
         note.editing_locked_by = None
         note.editing_locked_at = None
         self.db.commit()
-        self.db.refresh(note)
 
     def increment_view_count(self, note_id: int) -> Note:
         """Increment the view count of a note."""
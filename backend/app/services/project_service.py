@@ -1,6 +1,11 @@
 """Service for Project operations."""
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
 from sqlalchemy.orm import Session
-from typing import List, Optional, AsyncGenerator
+from starlette.concurrency import run_in_threadpool
+from typing import Dict, Iterator, List, Optional, AsyncGenerator, Tuple
 
 from app.models.project import Project
 from app.models.note import Note
@@ -18,6 +23,27 @@ from app.core.errors import NotFoundError
 from app.services.ask_service import get_ask_service, AskServiceError
 
 
+# System prompt header for project questions; the AI context follows it
+PROJECT_ASK_PROMPT_HEADER = """あなたは「{project_name}」プロジェクトのナレッジアシスタントです。
+以下のプロジェクト関連ノートの内容を基に、ユーザーの質問に回答してください。
+回答は正確かつ簡潔に行い、ノートに記載されていない情報については推測であることを明示してください。
+
+"""
+
+AI_CONTEXT_CACHE_SIZE = 256
+AI_CONTEXT_CACHE_TTL_SECONDS = 60
+
+# (project_id, project_name, max_notes, note_count, max_updated_at)
+_AIContextKey = Tuple[int, str, int, int, Optional[datetime]]
+
+# Process-wide LRU of built AI contexts: key -> (stored_at, context chunks)
+_ai_context_cache: "OrderedDict[_AIContextKey, Tuple[float, Tuple[str, ...]]]" = (
+    OrderedDict()
+)
+# Routes run in worker threads; guards every read and write of the cache
+_ai_context_cache_lock = threading.Lock()
+
+
 class ProjectService:
     """Service for project business logic."""
 
@@ -116,11 +142,17 @@ class ProjectService:
         """
         return self.project_repo.search_by_name(query)
 
-    def get_project_response(self, project_id: int) -> ProjectResponse:
+    def get_project_response(
+        self,
+        project_id: int,
+        company_cache: Optional[Dict[int, CompanyResponse]] = None,
+    ) -> ProjectResponse:
         """Get project response with note count.
 
         Args:
             project_id: Project ID.
+            company_cache: Optional dict shared across calls when building
+                several responses, so each company is fetched only once.
 
         Returns:
             ProjectResponse with note_count.
@@ -133,16 +165,9 @@ class ProjectService:
 
         company_response = None
         if project.company_id:
-            company = self.company_repo.get_by_id(project.company_id)
-            if company:
-                company_project_count = self.company_repo.get_project_count(company.id)
-                company_response = CompanyResponse(
-                    id=company.id,
-                    name=company.name,
-                    created_at=company.created_at,
-                    updated_at=company.updated_at,
-                    project_count=company_project_count
-                )
+            company_response = self._get_company_response(
+                project.company_id, company_cache
+            )
 
         return ProjectResponse(
             id=project.id,
@@ -154,31 +179,69 @@ class ProjectService:
             note_count=note_count
         )
 
+    def get_project_responses(
+        self, projects: List[Project]
+    ) -> List[ProjectResponse]:
+        """Get project responses for several projects.
+
+        Company lookups are memoized across the batch.
+
+        Args:
+            projects: Projects to build responses for.
+
+        Returns:
+            List of ProjectResponse with note_count.
+        """
+        company_cache: Dict[int, CompanyResponse] = {}
+        return [
+            self.get_project_response(project.id, company_cache)
+            for project in projects
+        ]
+
+    def _get_company_response(
+        self,
+        company_id: int,
+        company_cache: Optional[Dict[int, CompanyResponse]] = None,
+    ) -> Optional[CompanyResponse]:
+        """Build a CompanyResponse, consulting company_cache if given."""
+        if company_cache is not None and company_id in company_cache:
+            return company_cache[company_id]
+
+        company_response = None
+        company = self.company_repo.get_by_id(company_id)
+        if company:
+            company_project_count = self.company_repo.get_project_count(company.id)
+            company_response = CompanyResponse(
+                id=company.id,
+                name=company.name,
+                created_at=company.created_at,
+                updated_at=company.updated_at,
+                project_count=company_project_count
+            )
+
+        if company_cache is not None and company_response is not None:
+            company_cache[company_id] = company_response
+        return company_response
+
     def get_all_projects_with_count(self) -> List[ProjectResponse]:
         """Get all projects with note counts.
 
         Returns:
             List of ProjectResponse with note_count.
         """
-        projects = self.project_repo.get_all()
         result = []
-        for project in projects:
-            note_count = self.project_repo.get_note_count(project.id)
-
+        for project, company, note_count, company_project_count in (
+            self.project_repo.list_with_counts()
+        ):
             company_response = None
-            if project.company_id:
-                company = self.company_repo.get_by_id(project.company_id)
-                if company:
-                    company_project_count = self.company_repo.get_project_count(
-                        company.id
-                    )
-                    company_response = CompanyResponse(
-                        id=company.id,
-                        name=company.name,
-                        created_at=company.created_at,
-                        updated_at=company.updated_at,
-                        project_count=company_project_count
-                    )
+            if company:
+                company_response = CompanyResponse(
+                    id=company.id,
+                    name=company.name,
+                    created_at=company.created_at,
+                    updated_at=company.updated_at,
+                    project_count=company_project_count
+                )
 
             result.append(ProjectResponse(
                 id=project.id,
@@ -249,33 +312,89 @@ class ProjectService:
         Raises:
             NotFoundError: If project not found.
         """
-        project = self.get_project(project_id)
-        notes = self.project_repo.get_notes(project_id)
+        return "".join(self._get_ai_context_parts(project_id, max_notes))
 
-        # Limit number of notes
-        notes = notes[:max_notes]
+    def iter_ai_context(
+        self, project_id: int, max_notes: int = 50
+    ) -> Iterator[str]:
+        """Yield the AI context of build_ai_context in chunks.
 
-        if not notes:
-            return f"プロジェクト「{project.name}」にはまだノートがありません。"
+        Lets callers stream the context (e.g. into a request body) without
+        joining the note contents into one string.
 
-        # Build context from notes
-        context_parts = [
-            f"以下は「{project.name}」プロジェクトのノート内容です。",
-            f"ノート数: {len(notes)}件",
-            "",
-            "---",
-            ""
+        Args:
+            project_id: Project ID.
+            max_notes: Maximum number of notes to include (default 50).
+
+        Yields:
+            Consecutive chunks of the formatted context.
+
+        Raises:
+            NotFoundError: If project not found.
+        """
+        yield from self._get_ai_context_parts(project_id, max_notes)
+
+    def build_prompt_parts(self, project_id: int) -> List[str]:
+        """Build the prompt for a project question as chunks.
+
+        Args:
+            project_id: Project ID.
+
+        Returns:
+            The prompt header followed by the AI context chunks.
+
+        Raises:
+            NotFoundError: If project not found.
+        """
+        project = self.get_project(project_id)
+        return [
+            PROJECT_ASK_PROMPT_HEADER.format(project_name=project.name),
+            *self.iter_ai_context(project_id),
         ]
 
-        for note in notes:
-            context_parts.append(f"## {note.title}")
-            context_parts.append("")
-            context_parts.append(note.content_md or "(内容なし)")
-            context_parts.append("")
-            context_parts.append("---")
-            context_parts.append("")
+    def _get_ai_context_parts(
+        self, project_id: int, max_notes: int
+    ) -> Tuple[str, ...]:
+        """Get the AI context chunks, reusing the cached ones if current."""
+        project = self.get_project(project_id)
+
+        # Any note edit bumps updated_at and any add/delete changes the
+        # count, so a matching key means the context is still current.
+        note_count, max_updated_at = self.project_repo.get_note_stats(project_id)
+        if note_count == 0:
+            return (f"プロジェクト「{project.name}」にはまだノートがありません。",)
+
+        key: _AIContextKey = (
+            project_id, project.name, max_notes, note_count, max_updated_at
+        )
+        now = time.monotonic()
+        with _ai_context_cache_lock:
+            cached = _ai_context_cache.get(key)
+            if cached and now - cached[0] < AI_CONTEXT_CACHE_TTL_SECONDS:
+                _ai_context_cache.move_to_end(key)
+                return cached[1]
 
-        return "\n".join(context_parts)
+        notes = self.project_repo.get_note_contents(project_id, limit=max_notes)
+
+        # Build context from notes
+        parts = [
+            f"以下は「{project.name}」プロジェクトのノート内容です。\n"
+            f"ノート数: {len(notes)}件\n\n---\n\n"
+        ]
+        for i, (title, content_md) in enumerate(notes):
+            if i:
+                parts.append("\n\n---\n\n")
+            parts.append(f"## {title}\n\n")
+            parts.append(content_md or "(内容なし)")
+        parts.append("\n\n---\n")
+        context_parts = tuple(parts)
+
+        with _ai_context_cache_lock:
+            _ai_context_cache[key] = (now, context_parts)
+            _ai_context_cache.move_to_end(key)
+            while len(_ai_context_cache) > AI_CONTEXT_CACHE_SIZE:
+                _ai_context_cache.popitem(last=False)
+        return context_parts
 
     async def ask_project(
         self,
@@ -300,22 +419,18 @@ class ProjectService:
             NotFoundError: If project not found.
             AskServiceError: If AI service is not available.
         """
-        project = self.get_project(project_id)
-        context = self.build_ai_context(project_id)
-
-        # Build the prompt with context
-        template = f"""あなたは「{project.name}」プロジェクトのナレッジアシスタントです。
-以下のプロジェクト関連ノートの内容を基に、ユーザーの質問に回答してください。
-回答は正確かつ簡潔に行い、ノートに記載されていない情報については推測であることを明示してください。
-
-{context}"""
+        # The prompt is built with sync DB queries; run them in a worker
+        # thread so the event loop keeps serving other streams meanwhile.
+        template_parts = await run_in_threadpool(
+            self.build_prompt_parts, project_id
+        )
 
         ask_service = get_ask_service()
 
         async for event in ask_service.chat(
             user_input=question,
             chat_id=chat_id,
-            template=template,
+            template_parts=template_parts,
         ):
             yield event
 
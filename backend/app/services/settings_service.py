@@ -1,153 +1,234 @@
 """Service for application settings management."""
 
+import threading
+import time
+
+from typing import Any
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
+from app.db.base import now_jst
 from app.models import AppSettings, SettingsKey
 from app.schemas.settings import SettingsResponse, SettingsUpdate
 
 # Default AI model
 DEFAULT_AI_MODEL = "gemini-2.5-flash"
 
+# Keys read by this service, loaded together in one query
+_SETTINGS_KEYS = (
+    SettingsKey.DISCORD_NOTIFICATION_ENABLED,
+    SettingsKey.DISCORD_NOTIFY_ON_CREATE,
+    SettingsKey.DISCORD_NOTIFY_ON_UPDATE,
+    SettingsKey.DISCORD_NOTIFY_ON_COMMENT,
+    SettingsKey.AI_MODEL,
+)
+
+# Keys stored as "true"/"false"; parsed to bool once when loaded
+_BOOLEAN_KEYS = frozenset({
+    SettingsKey.DISCORD_NOTIFICATION_ENABLED,
+    SettingsKey.DISCORD_NOTIFY_ON_CREATE,
+    SettingsKey.DISCORD_NOTIFY_ON_UPDATE,
+    SettingsKey.DISCORD_NOTIFY_ON_COMMENT,
+})
+
+# The cache is per process: with several workers, a write made through
+# one worker is seen by the others once their snapshot expires.
+SETTINGS_CACHE_TTL_SECONDS = 60
+
+# Process-wide snapshot of the stored settings: (loaded_at, key -> value).
+# The generation is bumped on every write so that a snapshot loaded
+# concurrently with a write is not stored over the invalidation.
+_settings_cache: tuple[float, dict[str, str | bool]] | None = None
+_settings_cache_generation = 0
+_settings_cache_lock = threading.Lock()
+
+
+def invalidate_settings_cache() -> None:
+    """Drop the process-wide settings snapshot."""
+    global _settings_cache, _settings_cache_generation
+    with _settings_cache_lock:
+        _settings_cache = None
+        _settings_cache_generation += 1
+
 
 class SettingsService:
     """Service for managing application settings."""
 
     def __init__(self, db: Session):
         self.db = db
-
-    def _get_setting(self, key: str) -> AppSettings | None:
-        """Get a setting by key."""
-        return self.db.query(AppSettings).filter(AppSettings.key == key).first()
-
-    def _set_setting(
-        self, key: str, value: str, description: str | None = None
-    ) -> AppSettings:
-        """Set a setting value, creating if it doesn't exist."""
-        setting = self._get_setting(key)
-        if setting:
-            setting.value = value
-            if description:
-                setting.description = description
+        # key -> parsed value of the stored settings, loaded on first read
+        self._cache: dict[str, str | bool] | None = None
+
+    def _load_all(self) -> dict[str, str | bool]:
+        """Load the values of all known settings with a single query.
+
+        The values are shared process-wide for SETTINGS_CACHE_TTL_SECONDS,
+        so most calls do not touch the database at all.
+        """
+        global _settings_cache
+        if self._cache is not None:
+            return self._cache
+
+        now = time.monotonic()
+        with _settings_cache_lock:
+            cached = _settings_cache
+            generation = _settings_cache_generation
+        if cached and now - cached[0] < SETTINGS_CACHE_TTL_SECONDS:
+            self._cache = cached[1]
+            return self._cache
+
+        rows = (
+            self.db.query(AppSettings.key, AppSettings.value)
+            .filter(AppSettings.key.in_(_SETTINGS_KEYS))
+            .all()
+        )
+        self._cache = {
+            key: value.lower() == "true" if key in _BOOLEAN_KEYS else value
+            for key, value in rows
+        }
+        with _settings_cache_lock:
+            if generation == _settings_cache_generation:
+                _settings_cache = (now, self._cache)
+        return self._cache
+
+    def _get_value(self, key: str) -> str | None:
+        """Get the stored value of a text setting, or None if unset."""
+        value = self._load_all().get(key)
+        return value if isinstance(value, str) else None
+
+    def _get_bool(self, key: str, default: bool) -> bool:
+        """Get a boolean setting, falling back to default if unset."""
+        value = self._load_all().get(key)
+        return value if isinstance(value, bool) else default
+
+    def _upsert_settings(self, rows: list[dict[str, Any]]) -> None:
+        """Insert or update settings with a single statement.
+
+        Uses INSERT ... ON CONFLICT (key) DO UPDATE, which is atomic and
+        needs no SELECT to find out whether each key already exists.
+        Nothing is committed.
+        """
+        dialect = self.db.get_bind().dialect.name
+        stmt: Any
+        if dialect == "postgresql":
+            stmt = pg_insert(AppSettings).values(rows)
+        elif dialect == "sqlite":
+            stmt = sqlite_insert(AppSettings).values(rows)
         else:
-            setting = AppSettings(key=key, value=value, description=description)
-            self.db.add(setting)
-        self.db.commit()
-        self.db.refresh(setting)
-        return setting
+            for row in rows:
+                self.db.merge(AppSettings(**row))
+            return
+
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[AppSettings.key],
+            set_={
+                "value": stmt.excluded.value,
+                "description": stmt.excluded.description,
+                "updated_at": now_jst(),
+            },
+        )
+        self.db.execute(stmt)
 
     def get_all_settings(self) -> SettingsResponse:
         """Get all settings as a structured response."""
-        discord_setting = self._get_setting(SettingsKey.DISCORD_NOTIFICATION_ENABLED)
-        discord_enabled = (
-            discord_setting.value.lower() == "true" if discord_setting else False
-        )
-
-        # Individual notification settings (default to True)
-        notify_create_setting = self._get_setting(SettingsKey.DISCORD_NOTIFY_ON_CREATE)
-        notify_on_create = (
-            notify_create_setting.value.lower() == "true"
-            if notify_create_setting
-            else True
-        )
-
-        notify_update_setting = self._get_setting(SettingsKey.DISCORD_NOTIFY_ON_UPDATE)
-        notify_on_update = (
-            notify_update_setting.value.lower() == "true"
-            if notify_update_setting
-            else True
-        )
-
-        notify_comment_setting = self._get_setting(
-            SettingsKey.DISCORD_NOTIFY_ON_COMMENT
-        )
-        notify_on_comment = (
-            notify_comment_setting.value.lower() == "true"
-            if notify_comment_setting
-            else True
-        )
-
-        ai_model_setting = self._get_setting(SettingsKey.AI_MODEL)
-        ai_model = ai_model_setting.value if ai_model_setting else DEFAULT_AI_MODEL
+        ai_model = self._get_value(SettingsKey.AI_MODEL)
 
+        # Individual notification settings default to True
         return SettingsResponse(
-            discord_notification_enabled=discord_enabled,
-            discord_notify_on_create=notify_on_create,
-            discord_notify_on_update=notify_on_update,
-            discord_notify_on_comment=notify_on_comment,
-            ai_model=ai_model,
+            discord_notification_enabled=self._get_bool(
+                SettingsKey.DISCORD_NOTIFICATION_ENABLED, False
+            ),
+            discord_notify_on_create=self._get_bool(
+                SettingsKey.DISCORD_NOTIFY_ON_CREATE, True
+            ),
+            discord_notify_on_update=self._get_bool(
+                SettingsKey.DISCORD_NOTIFY_ON_UPDATE, True
+            ),
+            discord_notify_on_comment=self._get_bool(
+                SettingsKey.DISCORD_NOTIFY_ON_COMMENT, True
+            ),
+            ai_model=ai_model if ai_model is not None else DEFAULT_AI_MODEL,
         )
 
     def update_settings(self, data: SettingsUpdate) -> SettingsResponse:
-        """Update settings."""
+        """Update settings in a single transaction."""
+        updates: list[tuple[str, str, str]] = []
         if data.discord_notification_enabled is not None:
-            self._set_setting(
+            updates.append((
                 SettingsKey.DISCORD_NOTIFICATION_ENABLED,
                 str(data.discord_notification_enabled).lower(),
                 "Discord Webhook通知の有効/無効",
-            )
+            ))
 
         if data.discord_notify_on_create is not None:
-            self._set_setting(
+            updates.append((
                 SettingsKey.DISCORD_NOTIFY_ON_CREATE,
                 str(data.discord_notify_on_create).lower(),
                 "ノート作成時のDiscord通知",
-            )
+            ))
 
         if data.discord_notify_on_update is not None:
-            self._set_setting(
+            updates.append((
                 SettingsKey.DISCORD_NOTIFY_ON_UPDATE,
                 str(data.discord_notify_on_update).lower(),
                 "ノート更新時のDiscord通知",
-            )
+            ))
 
         if data.discord_notify_on_comment is not None:
-            self._set_setting(
+            updates.append((
                 SettingsKey.DISCORD_NOTIFY_ON_COMMENT,
                 str(data.discord_notify_on_comment).lower(),
                 "コメント投稿時のDiscord通知",
-            )
+            ))
 
         if data.ai_model is not None:
-            self._set_setting(
+            updates.append((
                 SettingsKey.AI_MODEL,
                 data.ai_model,
                 "AI機能で使用するモデル",
-            )
+            ))
+
+        if updates:
+            self._upsert_settings([
+                {"key": key, "value": value, "description": description}
+                for key, value, description in updates
+            ])
+            self.db.commit()
+            self._cache = None
+            invalidate_settings_cache()
 
         return self.get_all_settings()
 
     def is_discord_notification_enabled(self) -> bool:
         """Check if Discord notification is enabled."""
-        setting = self._get_setting(SettingsKey.DISCORD_NOTIFICATION_ENABLED)
-        return setting.value.lower() == "true" if setting else False
+        return self._get_bool(SettingsKey.DISCORD_NOTIFICATION_ENABLED, False)
 
     def is_discord_notify_on_create_enabled(self) -> bool:
         """Check if Discord notification on note create is enabled."""
         if not self.is_discord_notification_enabled():
             return False
-        setting = self._get_setting(SettingsKey.DISCORD_NOTIFY_ON_CREATE)
-        return setting.value.lower() == "true" if setting else True
+        return self._get_bool(SettingsKey.DISCORD_NOTIFY_ON_CREATE, True)
 
     def is_discord_notify_on_update_enabled(self) -> bool:
         """Check if Discord notification on note update is enabled."""
         if not self.is_discord_notification_enabled():
             return False
-        setting = self._get_setting(SettingsKey.DISCORD_NOTIFY_ON_UPDATE)
-        return setting.value.lower() == "true" if setting else True
+        return self._get_bool(SettingsKey.DISCORD_NOTIFY_ON_UPDATE, True)
 
     def is_discord_notify_on_comment_enabled(self) -> bool:
         """Check if Discord notification on comment is enabled."""
         if not self.is_discord_notification_enabled():
             return False
-        setting = self._get_setting(SettingsKey.DISCORD_NOTIFY_ON_COMMENT)
-        return setting.value.lower() == "true" if setting else True
+        return self._get_bool(SettingsKey.DISCORD_NOTIFY_ON_COMMENT, True)
 
     def get_ai_model(self) -> str:
         """Get the configured AI model."""
-        setting = self._get_setting(SettingsKey.AI_MODEL)
-        if setting:
-            return setting.value
+        ai_model = self._get_value(SettingsKey.AI_MODEL)
+        if ai_model is not None:
+            return ai_model
         # Fall back to environment default, then hardcoded default
         env_settings = get_settings()
         return env_settings.ask_default_model or DEFAULT_AI_MODEL
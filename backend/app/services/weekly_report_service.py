@@ -4,6 +4,7 @@ Aggregates weekly reports from individual team members and creates
 achievement notes per project.
 """
 
+import asyncio
 from dataclasses import dataclass, field
 from datetime import timedelta
 from typing import Dict, List, Optional, Tuple
@@ -16,7 +17,11 @@ from app.models import Folder, Note, Project
 from app.repositories.folder_repo import FolderRepository
 from app.repositories.note_repo import NoteRepository
 from app.repositories.project_repo import ProjectRepository
-from app.services.ask_service import AskServiceError, get_ask_service
+from app.services.ask_service import (
+    AskService,
+    AskServiceError,
+    get_ask_service,
+)
 from app.utils.weekly_report_parser import (
     ProjectSection,
     get_week_label_from_date,
@@ -24,6 +29,10 @@ from app.utils.weekly_report_parser import (
 )
 
 
+# Maximum number of concurrent AI summarization requests
+SUMMARY_CONCURRENCY = 4
+
+
 @dataclass
 class AggregationResult:
     """Result of weekly report aggregation."""
@@ -53,14 +62,8 @@ class WeeklyReportService:
             List of folder IDs belonging to weekly report folders.
         """
         root_folders = self.folder_repo.get_root_folders()
-        folder_ids: List[int] = []
-
-        for root in root_folders:
-            if "週報" in root.name:
-                descendant_ids = self.folder_repo.get_all_descendant_ids(root.id)
-                folder_ids.extend(descendant_ids)
-
-        return folder_ids
+        root_ids = [root.id for root in root_folders if "週報" in root.name]
+        return self.folder_repo.get_all_descendant_ids_for_roots(root_ids)
 
     def get_weekly_notes(
         self,
@@ -106,7 +109,10 @@ class WeeklyReportService:
         if project:
             return project
 
-        # Fall back to project name only search
+        return self._find_project_by_name(project_name)
+
+    def _find_project_by_name(self, project_name: str) -> Optional[Project]:
+        """Find the only project whose name contains project_name."""
         projects = self.project_repo.search_by_name(project_name)
         if len(projects) == 1:
             return projects[0]
@@ -116,29 +122,36 @@ class WeeklyReportService:
     def get_linked_note_contents(
         self,
         note_ids: List[int],
+        prefetched: Optional[Dict[int, Note]] = None,
     ) -> Dict[int, str]:
         """Get content of linked notes.
 
         Args:
             note_ids: List of note IDs to fetch.
+            prefetched: Non-deleted notes already loaded by the caller,
+                keyed by ID. Only the remaining IDs are queried.
 
         Returns:
             Dictionary mapping note ID to formatted content.
         """
         contents: Dict[int, str] = {}
-        for note_id in note_ids:
-            try:
-                note = self.note_repo.get_by_id(note_id)
-                if note:
-                    # Truncate long content
-                    content = note.content_md[:1000]
-                    if len(note.content_md) > 1000:
-                        content += "..."
-                    contents[note_id] = (
-                        f"### 参照: #{note_id} {note.title}\n{content}"
-                    )
-            except Exception as e:
-                log_warning(f"Failed to get linked note {note_id}: {e}")
+        prefetched = prefetched or {}
+        notes = [
+            prefetched[note_id] for note_id in note_ids if note_id in prefetched
+        ]
+        missing_ids = [
+            note_id for note_id in note_ids if note_id not in prefetched
+        ]
+        try:
+            notes.extend(self.note_repo.get_by_ids(missing_ids))
+        except Exception as e:
+            log_warning(f"Failed to get linked notes {missing_ids}: {e}")
+
+        for note in notes:
+            # Truncate long content; short bodies are used as is
+            body = note.content_md
+            content = body if len(body) <= 1000 else body[:1000] + "..."
+            contents[note.id] = f"### 参照: #{note.id} {note.title}\n{content}"
         return contents
 
     def group_sections_by_project(
@@ -153,27 +166,46 @@ class WeeklyReportService:
         Returns:
             Dictionary mapping project ID to list of sections.
         """
-        grouped: Dict[int, List[ProjectSection]] = {}
+        # Resolve each distinct project reference once, in batches:
+        # direct IDs (e.g., @P1 format) first, then company/project names.
+        project_ids = {
+            section.project_id
+            for section in all_sections
+            if section.project_id is not None
+        }
+        projects_by_id = {
+            project.id: project
+            for project in self.project_repo.get_by_ids(list(project_ids))
+        }
+        for project_id in project_ids - projects_by_id.keys():
+            log_warning(f"Project not found by ID: {project_id}")
+
+        names = {
+            (section.company_name, section.project_name)
+            for section in all_sections
+            if section.project_id not in projects_by_id
+            and section.company_name
+            and section.project_name
+        }
+        projects_by_name: Dict[Tuple[str, str], Optional[Project]] = dict(
+            self.project_repo.find_by_company_and_names(list(names))
+        )
+        for company_name, project_name in names - projects_by_name.keys():
+            # Fall back to project name only search
+            project = self._find_project_by_name(project_name)
+            if not project:
+                log_warning(f"Project not found: {company_name}/{project_name}")
+            projects_by_name[(company_name, project_name)] = project
 
+        grouped: Dict[int, List[ProjectSection]] = {}
         for section in all_sections:
             project = None
-
-            # First, try direct project ID if available (e.g., @P1 format)
             if section.project_id is not None:
-                project = self.project_repo.get_by_id(section.project_id)
-                if not project:
-                    log_warning(f"Project not found by ID: {section.project_id}")
-
-            # Fall back to company/project name search
-            if project is None and section.company_name and section.project_name:
-                project = self.find_project(
-                    section.company_name,
-                    section.project_name,
+                project = projects_by_id.get(section.project_id)
+            if project is None:
+                project = projects_by_name.get(
+                    (section.company_name, section.project_name)
                 )
-                if not project:
-                    log_warning(
-                        f"Project not found: {section.company_name}/{section.project_name}"
-                    )
 
             if project:
                 if project.id not in grouped:
@@ -195,6 +227,7 @@ class WeeklyReportService:
         project: Project,
         sections: List[ProjectSection],
         linked_contents: Dict[int, str],
+        ask_service: Optional[AskService] = None,
     ) -> str:
         """Summarize project sections using AI.
 
@@ -202,6 +235,8 @@ class WeeklyReportService:
             project: The project being summarized.
             sections: List of project sections to summarize.
             linked_contents: Dictionary of linked note contents.
+            ask_service: ASK service to use, shared across projects by
+                run_aggregation. Looked up if omitted.
 
         Returns:
             AI-generated summary text.
@@ -210,15 +245,16 @@ class WeeklyReportService:
         formatted_sections = []
         for section in sections:
             author_label = section.author or "不明"
-            content = f"### {author_label} の報告\n{section.content}"
+            parts = [f"### {author_label} の報告\n{section.content}"]
 
             # Add linked note contents
-            if section.note_links:
-                for link_id in section.note_links:
-                    if link_id in linked_contents:
-                        content += f"\n\n{linked_contents[link_id]}"
+            parts.extend(
+                linked_contents[link_id]
+                for link_id in section.note_links
+                if link_id in linked_contents
+            )
 
-            formatted_sections.append(content)
+            formatted_sections.append("\n\n".join(parts))
 
         combined = "\n\n---\n\n".join(formatted_sections)
 
@@ -244,7 +280,8 @@ class WeeklyReportService:
 """
 
         try:
-            ask_service = get_ask_service()
+            if ask_service is None:
+                ask_service = get_ask_service()
             response, _ = await ask_service.chat_simple(
                 user_input=combined,
                 template=template,
@@ -255,22 +292,53 @@ class WeeklyReportService:
             # Fallback: return combined content without AI processing
             return combined
 
+    def get_achievement_note_title(self, project: Project) -> str:
+        """Get the title of a project's achievement note."""
+        return f"{project.name} 週報実績"
+
+    def get_achievement_candidates(
+        self,
+        projects: List[Project],
+    ) -> Dict[int, List[Note]]:
+        """Get existing achievement notes of several projects in one query.
+
+        Args:
+            projects: Projects to look up achievement notes for.
+
+        Returns:
+            Dictionary mapping project ID to notes titled like its
+            achievement note, most recently updated first.
+        """
+        notes = self.project_repo.get_notes_by_titles(
+            [project.id for project in projects],
+            [self.get_achievement_note_title(project) for project in projects],
+        )
+        candidates: Dict[int, List[Note]] = {}
+        for note in notes:
+            if note.project_id is not None:
+                candidates.setdefault(note.project_id, []).append(note)
+        return candidates
+
     def get_or_create_achievement_note(
         self,
         project: Project,
+        notes: Optional[List[Note]] = None,
     ) -> Tuple[Note, bool]:
         """Get or create an achievement note for a project.
 
         Args:
             project: The project to get/create achievement note for.
+            notes: Preloaded notes of the project to search, e.g. from
+                get_achievement_candidates. Queried if omitted.
 
         Returns:
             Tuple of (note, is_new) where is_new is True if newly created.
         """
-        title = f"{project.name} 週報実績"
+        title = self.get_achievement_note_title(project)
 
         # Search for existing achievement note
-        notes = self.project_repo.get_notes(project.id)
+        if notes is None:
+            notes = self.project_repo.get_notes(project.id)
         for note in notes:
             if note.title == title:
                 return note, False
@@ -288,6 +356,7 @@ class WeeklyReportService:
         self,
         note: Note,
         summary: str,
+        week_label: Optional[str] = None,
     ) -> Note:
         """Prepend weekly summary to achievement note.
 
@@ -297,19 +366,24 @@ class WeeklyReportService:
         Args:
             note: The achievement note to update.
             summary: The summary to prepend.
+            week_label: Heading for the summary. Defaults to the label of
+                the current week.
 
         Returns:
             Updated note.
         """
         header = "# 週報実績\n\n"
-        week_label = self.get_week_label()
+        if week_label is None:
+            week_label = self.get_week_label()
 
         existing = note.content_md
-        if existing.startswith(header):
-            existing = existing[len(header) :]
+        tail_offset = len(header) if existing.startswith(header) else 0
 
-        new_entry = f"## {week_label}\n\n{summary}\n\n---\n\n"
-        new_content = header + new_entry + existing
+        new_content = "".join([
+            header,
+            f"## {week_label}\n\n{summary}\n\n---\n\n",
+            existing[tail_offset:],
+        ])
 
         return self.note_repo.update(note, content_md=new_content)
 
@@ -355,38 +429,71 @@ class WeeklyReportService:
 
         log_info(f"Parsed {len(all_sections)} project section(s)")
 
-        # 4. Get linked note contents
-        linked_contents = self.get_linked_note_contents(list(all_link_ids))
+        # 4. Get linked note contents; links to other weekly notes are
+        # served from the notes already loaded above.
+        linked_contents = self.get_linked_note_contents(
+            list(all_link_ids),
+            prefetched={note.id: note for note in notes},
+        )
         log_info(f"Retrieved {len(linked_contents)} linked note(s)")
 
         # 5. Group sections by project
         grouped = self.group_sections_by_project(all_sections)
 
-        # 6. Process each project
-        for project_id, sections in grouped.items():
-            try:
-                project = self.project_repo.get_by_id(project_id)
-                if not project:
-                    continue
+        # 6. Load the projects and their achievement notes in batches
+        projects_by_id = {
+            project.id: project
+            for project in self.project_repo.get_by_ids(list(grouped))
+        }
+        achievement_candidates = self.get_achievement_candidates(
+            list(projects_by_id.values())
+        )
 
-                # Summarize with AI
-                summary = await self.summarize_project(
-                    project, sections, linked_contents
+        # 7. Summarize the projects concurrently with AI; the session is
+        # not used while summarizing, so DB writes stay sequential below.
+        targets = [
+            (projects_by_id[project_id], sections)
+            for project_id, sections in grouped.items()
+            if project_id in projects_by_id
+        ]
+        semaphore = asyncio.Semaphore(SUMMARY_CONCURRENCY)
+        ask_service = get_ask_service()
+
+        async def summarize(
+            project: Project, sections: List[ProjectSection]
+        ) -> str:
+            async with semaphore:
+                return await self.summarize_project(
+                    project, sections, linked_contents, ask_service
                 )
 
+        summaries = await asyncio.gather(
+            *(summarize(project, sections) for project, sections in targets),
+            return_exceptions=True,
+        )
+
+        # 8. Prepend each summary to the project's achievement note
+        week_label = self.get_week_label()
+        for (project, _), summary in zip(targets, summaries):
+            try:
+                if isinstance(summary, BaseException):
+                    raise summary
+
                 # Get or create achievement note
-                note, is_new = self.get_or_create_achievement_note(project)
+                note, is_new = self.get_or_create_achievement_note(
+                    project, achievement_candidates.get(project.id, [])
+                )
                 if is_new:
                     result.achievement_notes_created += 1
 
                 # Prepend summary
-                self.prepend_summary_to_note(note, summary)
+                self.prepend_summary_to_note(note, summary, week_label)
                 result.projects_updated += 1
 
                 log_info(f"Updated achievement note for project: {project.name}")
 
             except Exception as e:
-                error_msg = f"Failed to process project {project_id}: {e}"
+                error_msg = f"Failed to process project {project.id}: {e}"
                 log_error(error_msg)
                 result.errors.append(error_msg)
 
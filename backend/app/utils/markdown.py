@@ -1,8 +1,34 @@
 import re
+from functools import lru_cache
 from typing import List, Tuple
 from dataclasses import dataclass
 
 
+# Patterns are compiled once at import; these run on every note render.
+_H2_RE = re.compile(r"^##\s+(.+)$", re.MULTILINE)
+_SLUG_STRIP_RE = re.compile(r"[^\w\s\u3040-\u309f\u30a0-\u30ff\u4e00-\u9fff-]")
+_WHITESPACE_RE = re.compile(r"\s+")
+_NOTE_LINK_RE = re.compile(r"(?<![#\w])#(\d+)(?!\d)")
+_PROJECT_LINK_RE = re.compile(r"(?<![a-zA-Z0-9_])@P(\d+)(?!\d)")
+_H2_HTML_RE = re.compile(r"<h2>([^<]+)</h2>")
+
+# Markdown stripping for generate_summary
+_CODE_BLOCK_RE = re.compile(r"```[\s\S]*?```")
+_INLINE_CODE_RE = re.compile(r"`[^`]+`")
+_HEADING_MARKER_RE = re.compile(r"^#{1,6}\s+", re.MULTILINE)
+_BOLD_RE = re.compile(r"\*\*([^*]+)\*\*")
+_ITALIC_RE = re.compile(r"\*([^*]+)\*")
+_BOLD_UNDERSCORE_RE = re.compile(r"__([^_]+)__")
+_ITALIC_UNDERSCORE_RE = re.compile(r"_([^_]+)_")
+_LINK_RE = re.compile(r"\[([^\]]+)\]\([^)]+\)")
+_IMAGE_RE = re.compile(r"!\[([^\]]*)\]\([^)]+\)")
+_BLOCKQUOTE_RE = re.compile(r"^>\s*", re.MULTILINE)
+_BULLET_RE = re.compile(r"^[\s]*[-*+]\s+", re.MULTILINE)
+_ORDERED_LIST_RE = re.compile(r"^[\s]*\d+\.\s+", re.MULTILINE)
+_HR_RE = re.compile(r"^[-*_]{3,}$", re.MULTILINE)
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+
+
 @dataclass
 class TocItem:
     """Table of contents item."""
@@ -26,9 +52,7 @@ def extract_toc(content: str) -> List[TocItem]:
     """
     toc_items = []
     # Match ## headings (h2 only)
-    pattern = r"^##\s+(.+)$"
-
-    for match in re.finditer(pattern, content, re.MULTILINE):
+    for match in _H2_RE.finditer(content):
         text = match.group(1).strip()
         # Generate ID from text (slugify)
         item_id = slugify(text)
@@ -37,75 +61,97 @@ def extract_toc(content: str) -> List[TocItem]:
     return toc_items
 
 
+@lru_cache(maxsize=2048)
 def slugify(text: str) -> str:
-    """Convert text to URL-safe slug for heading IDs."""
+    """Convert text to URL-safe slug for heading IDs.
+
+    Memoized: the same headings are slugified for the TOC and for the
+    rendered HTML.
+    """
     # Remove special characters, keep alphanumeric and spaces
-    slug = re.sub(r"[^\w\s\u3040-\u309f\u30a0-\u30ff\u4e00-\u9fff-]", "", text)
+    slug = _SLUG_STRIP_RE.sub("", text)
     # Replace spaces with hyphens
-    slug = re.sub(r"\s+", "-", slug)
+    slug = _WHITESPACE_RE.sub("-", slug)
     # Lowercase
     slug = slug.lower()
     return slug or "section"
 
 
-def extract_note_links(content: str) -> List[int]:
-    """Extract note IDs from #ID references in content.
+def extract_note_links(content: str) -> set[int]:
+    """Extract unique note IDs from #ID references in content.
 
     Pattern: #<number> (e.g., #1, #42, #123)
     """
     # Match #<number> pattern, not part of a heading
-    pattern = r"(?<![#\w])#(\d+)(?!\d)"
-    matches = re.findall(pattern, content)
-    # Return unique note IDs
-    return list(set(int(m) for m in matches))
+    return {int(m) for m in _NOTE_LINK_RE.findall(content)}
+
+
+# Raw characters per summary character scanned before the full body
+SUMMARY_PREFIX_FACTOR = 8
 
 
 def generate_summary(content: str, max_length: int = 200) -> str:
     """Generate a plain text summary from markdown content.
 
     Removes markdown formatting and returns first N characters.
+    Only a prefix of long content is processed; the full content is used
+    when the prefix yields too little text.
     """
+    head = content[: max_length * SUMMARY_PREFIX_FACTOR]
+    if len(head) < len(content):
+        if head.count("```") % 2:
+            # Drop a code block that the prefix cuts in half
+            head = head[: head.rfind("```")]
+        text = _strip_markdown(head)
+        if len(text) > max_length:
+            return _truncate(text, max_length)
+    return _truncate(_strip_markdown(content), max_length)
+
+
+def _strip_markdown(content: str) -> str:
+    """Remove markdown formatting and collapse whitespace."""
     # Remove code blocks
-    text = re.sub(r"```[\s\S]*?```", "", content)
-    text = re.sub(r"`[^`]+`", "", text)
+    text = _CODE_BLOCK_RE.sub("", content)
+    text = _INLINE_CODE_RE.sub("", text)
 
     # Remove headings markers
-    text = re.sub(r"^#{1,6}\s+", "", text, flags=re.MULTILINE)
+    text = _HEADING_MARKER_RE.sub("", text)
 
     # Remove bold/italic markers
-    text = re.sub(r"\*\*([^*]+)\*\*", r"\1", text)
-    text = re.sub(r"\*([^*]+)\*", r"\1", text)
-    text = re.sub(r"__([^_]+)__", r"\1", text)
-    text = re.sub(r"_([^_]+)_", r"\1", text)
+    text = _BOLD_RE.sub(r"\1", text)
+    text = _ITALIC_RE.sub(r"\1", text)
+    text = _BOLD_UNDERSCORE_RE.sub(r"\1", text)
+    text = _ITALIC_UNDERSCORE_RE.sub(r"\1", text)
 
     # Remove links but keep text
-    text = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", text)
+    text = _LINK_RE.sub(r"\1", text)
 
     # Remove images
-    text = re.sub(r"!\[([^\]]*)\]\([^)]+\)", "", text)
+    text = _IMAGE_RE.sub("", text)
 
     # Remove blockquotes markers
-    text = re.sub(r"^>\s*", "", text, flags=re.MULTILINE)
+    text = _BLOCKQUOTE_RE.sub("", text)
 
     # Remove list markers
-    text = re.sub(r"^[\s]*[-*+]\s+", "", text, flags=re.MULTILINE)
-    text = re.sub(r"^[\s]*\d+\.\s+", "", text, flags=re.MULTILINE)
+    text = _BULLET_RE.sub("", text)
+    text = _ORDERED_LIST_RE.sub("", text)
 
     # Remove horizontal rules
-    text = re.sub(r"^[-*_]{3,}$", "", text, flags=re.MULTILINE)
+    text = _HR_RE.sub("", text)
 
     # Remove HTML tags (should be disabled, but just in case)
-    text = re.sub(r"<[^>]+>", "", text)
+    text = _HTML_TAG_RE.sub("", text)
+
+    # Collapse multiple newlines/spaces (newlines are whitespace too)
+    text = _WHITESPACE_RE.sub(" ", text)
 
-    # Collapse multiple newlines/spaces
-    text = re.sub(r"\n+", " ", text)
-    text = re.sub(r"\s+", " ", text)
+    return text.strip()
 
-    # Trim and truncate
-    text = text.strip()
+
+def _truncate(text: str, max_length: int) -> str:
+    """Cut text to max_length at a word boundary."""
     if len(text) > max_length:
         text = text[:max_length].rsplit(" ", 1)[0] + "..."
-
     return text
 
 
@@ -120,8 +166,7 @@ def render_note_links(content: str, existing_ids: set[int]) -> str:
             return f'<a href="/notes/{note_id}" data-note-id="{note_id}">#{note_id}</a>'
         return match.group(0)
 
-    pattern = r"(?<![#\w])#(\d+)(?!\d)"
-    return re.sub(pattern, replace_link, content)
+    return _NOTE_LINK_RE.sub(replace_link, content)
 
 
 def add_heading_ids(content: str) -> str:
@@ -132,22 +177,18 @@ def add_heading_ids(content: str) -> str:
         return f'<h2 id="{heading_id}">{text}</h2>'
 
     # This is meant to be used after markdown rendering
-    pattern = r"<h2>([^<]+)</h2>"
-    return re.sub(pattern, replace_heading, content)
+    return _H2_HTML_RE.sub(replace_heading, content)
 
 
-def extract_project_links(content: str) -> List[int]:
-    """Extract project IDs from @P<ID> references in content.
+def extract_project_links(content: str) -> set[int]:
+    """Extract unique project IDs from @P<ID> references in content.
 
     Pattern: @P<number> (e.g., @P1, @P42)
     The pattern requires @ to not be preceded by alphanumeric characters
     to avoid matching email-like patterns.
     """
     # Match @P<number> pattern, not part of an email or word
-    pattern = r"(?<![a-zA-Z0-9_])@P(\d+)(?!\d)"
-    matches = re.findall(pattern, content)
-    # Return unique project IDs
-    return list(set(int(m) for m in matches))
+    return {int(m) for m in _PROJECT_LINK_RE.findall(content)}
 
 
 def render_project_links(content: str, existing_ids: set[int]) -> str:
@@ -165,5 +206,4 @@ def render_project_links(content: str, existing_ids: set[int]) -> str:
             )
         return f'<span class="project-link-invalid">@P{project_id}</span>'
 
-    pattern = r"(?<![a-zA-Z0-9_])@P(\d+)(?!\d)"
-    return re.sub(pattern, replace_link, content)
+    return _PROJECT_LINK_RE.sub(replace_link, content)
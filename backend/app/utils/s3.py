@@ -1,12 +1,37 @@
+import certifi
+import urllib3
 from minio import Minio
 from minio.error import S3Error
-from typing import Optional, BinaryIO
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from typing import Any, Dict, Iterable, Iterator, List, Optional, BinaryIO, Tuple
 from io import BytesIO
+import os
+import threading
 import uuid
 
 from app.core.config import get_settings
 from app.core.logging import log_error, log_info
 
+# Part size for multipart uploads of large buffers. Larger parts mean
+# fewer requests per object; minio picks a size itself when given 0.
+UPLOAD_PART_SIZE = 16 * 1024 * 1024
+
+# Chunk size for streamed downloads
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Worker threads for download_many/upload_many
+TRANSFER_WORKERS = 16
+
+# Pooled connections kept per host. Must exceed TRANSFER_WORKERS plus the
+# request threads using the client so they never wait for a connection.
+HTTP_POOL_MAXSIZE = 100
+
 
 def _get_lazy_settings():
     """Get settings lazily to allow environment override in tests."""
@@ -18,20 +43,46 @@ class MinIOClient:
 
     def __init__(self) -> None:
         settings = _get_lazy_settings()
+        # Same as minio's default client apart from the pool size and
+        # timeouts; block=False opens extra connections under bursts
+        # instead of waiting for a free one.
+        http_client = urllib3.PoolManager(
+            num_pools=10,
+            maxsize=HTTP_POOL_MAXSIZE,
+            block=False,
+            timeout=urllib3.Timeout(connect=2, read=30),
+            cert_reqs="CERT_REQUIRED",
+            ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+            retries=urllib3.Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=[500, 502, 503, 504],
+            ),
+        )
         self.client = Minio(
             settings.minio_host,
             access_key=settings.minio_access_key,
             secret_key=settings.minio_secret_key,
             secure=settings.minio_secure,
+            http_client=http_client,
         )
         self.bucket = settings.minio_bucket
+        # Set once the bucket is known to exist; buckets are not deleted
+        # while the app runs, so it is checked once per client
+        self._bucket_checked = False
+        self._pool = ThreadPoolExecutor(
+            max_workers=TRANSFER_WORKERS, thread_name_prefix="minio"
+        )
 
     def ensure_bucket_exists(self) -> None:
         """Ensure the bucket exists, create if not."""
+        if self._bucket_checked:
+            return
         try:
             if not self.client.bucket_exists(self.bucket):
                 self.client.make_bucket(self.bucket)
                 log_info(f"Created bucket: {self.bucket}")
+            self._bucket_checked = True
         except S3Error as e:
             log_error(f"Failed to ensure bucket exists: {e}")
             raise
@@ -50,8 +101,13 @@ class MinIOClient:
         key: str,
         content_type: str,
         size: int,
+        part_size: int = 0,
     ) -> str:
-        """Upload a file to MinIO."""
+        """Upload a file to MinIO.
+
+        Objects larger than part_size are uploaded as multipart, with the
+        parts sent in parallel. 0 lets minio choose the part size.
+        """
         try:
             self.client.put_object(
                 self.bucket,
@@ -59,6 +115,7 @@ class MinIOClient:
                 file_data,
                 size,
                 content_type=content_type,
+                part_size=part_size,
             )
             log_info(f"Uploaded file: {key}")
             return key
@@ -71,10 +128,14 @@ class MinIOClient:
         data: bytes,
         key: str,
         content_type: str,
+        part_size: int = UPLOAD_PART_SIZE,
     ) -> str:
         """Upload bytes to MinIO."""
+        # BytesIO shares the bytes buffer until written to, so no copy
         file_data = BytesIO(data)
-        return self.upload_file(file_data, key, content_type, len(data))
+        return self.upload_file(
+            file_data, key, content_type, len(data), part_size=part_size
+        )
 
     def download_file(self, key: str) -> bytes:
         """Download a file from MinIO."""
@@ -88,6 +149,105 @@ class MinIOClient:
             log_error(f"Failed to download file: {e}")
             raise
 
+    def iter_download(
+        self,
+        key: str,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        """Download a file from MinIO in chunks.
+
+        The object is requested right away, so a missing file raises here
+        rather than while the chunks are consumed. Only one chunk is held
+        in memory at a time.
+        """
+        try:
+            response = self.client.get_object(self.bucket, key)
+        except S3Error as e:
+            log_error(f"Failed to download file: {e}")
+            raise
+        return self._iter_response(response, chunk_size)
+
+    @staticmethod
+    def _iter_response(response: Any, chunk_size: int) -> Iterator[bytes]:
+        """Yield the body of a get_object response and release it."""
+        try:
+            yield from response.stream(chunk_size)
+        finally:
+            response.close()
+            response.release_conn()
+
+    def iter_downloads(self, keys: Iterable[str]) -> Iterator[Tuple[str, bytes]]:
+        """Download several files from MinIO concurrently, as they complete.
+
+        At most TRANSFER_WORKERS downloads are in flight or waiting to be
+        consumed, so memory stays bounded however many keys are given.
+
+        Args:
+            keys: Storage keys to download.
+
+        Yields:
+            (key, content) of each download in completion order. Keys that
+            failed to download are logged and skipped.
+        """
+        futures: Dict[Future[bytes], str] = {}
+        for key in dict.fromkeys(keys):
+            if len(futures) >= TRANSFER_WORKERS:
+                yield from self._drain_completed(futures)
+            futures[self._pool.submit(self.download_file, key)] = key
+        while futures:
+            yield from self._drain_completed(futures)
+
+    @staticmethod
+    def _drain_completed(
+        futures: Dict[Future[bytes], str],
+    ) -> Iterator[Tuple[str, bytes]]:
+        """Wait for downloads to complete and yield their results."""
+        done, _ = wait(futures, return_when=FIRST_COMPLETED)
+        for future in done:
+            key = futures.pop(future)
+            try:
+                yield key, future.result()
+            except Exception as e:
+                log_error(f"Failed to download file {key}: {e}")
+
+    def download_many(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        """Download several files from MinIO concurrently.
+
+        Args:
+            keys: Storage keys to download.
+
+        Returns:
+            Dictionary mapping each downloaded key to its content. Keys
+            that failed to download are logged and left out.
+        """
+        return dict(self.iter_downloads(keys))
+
+    def upload_many(
+        self,
+        items: Iterable[Tuple[bytes, str, str]],
+    ) -> List[str]:
+        """Upload several byte buffers to MinIO concurrently.
+
+        Args:
+            items: (data, key, content_type) of each upload.
+
+        Returns:
+            Keys of the uploaded files. Failed uploads are logged and
+            left out.
+        """
+        futures = {
+            self._pool.submit(self.upload_bytes, data, key, content_type): key
+            for data, key, content_type in items
+        }
+        uploaded: List[str] = []
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                uploaded.append(future.result())
+            except Exception as e:
+                log_error(f"Failed to upload file {key}: {e}")
+        return uploaded
+
     def get_file_stream(self, key: str) -> BinaryIO:
         """Get a file stream from MinIO."""
         try:
@@ -131,11 +291,18 @@ class MinIOClient:
 
 # Singleton instance
 _minio_client: Optional[MinIOClient] = None
+_minio_client_lock = threading.Lock()
 
 
 def get_minio_client() -> MinIOClient:
-    """Get or create MinIO client instance."""
+    """Get or create MinIO client instance.
+
+    Thread-safe: concurrent first calls share one client, and so one
+    connection pool.
+    """
     global _minio_client
     if _minio_client is None:
-        _minio_client = MinIOClient()
+        with _minio_client_lock:
+            if _minio_client is None:
+                _minio_client = MinIOClient()
     return _minio_client
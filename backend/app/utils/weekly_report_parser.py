@@ -5,12 +5,20 @@ Parses weekly report notes to extract project sections in the format:
 - 作業内容
 """
 
+import io
 import re
 from dataclasses import dataclass, field
 from typing import List, Optional
 
 from app.utils.markdown import extract_note_links
 
+# Section header in either format, matched in one pass:
+#   ## @P{ID} (short format with project ID) -> pid
+#   ## @P 会社名/プロジェクト名 (full format) -> company, project
+_HEADER_RE = re.compile(
+    r"^##\s+@P(?:(?P<pid>\d+)|\s+(?P<company>.+?)/(?P<project>.+?))\s*$"
+)
+
 
 @dataclass
 class ProjectSection:
@@ -51,32 +59,32 @@ def parse_weekly_report(
     """
     sections: List[ProjectSection] = []
 
-    # Pattern 1: ## @P 会社名/プロジェクト名 (full format)
-    pattern_full = r"^##\s+@P\s+(.+?)/(.+?)\s*$"
-    # Pattern 2: ## @P{ID} (short format with project ID)
-    pattern_short = r"^##\s+@P(\d+)\s*$"
-
-    lines = content.split("\n")
     current_section: Optional[ProjectSection] = None
     current_content: List[str] = []
 
-    for line in lines:
-        match_full = re.match(pattern_full, line)
-        match_short = re.match(pattern_short, line)
+    # Lines keep their "\n", so section bodies are joined with ""
+    for line in io.StringIO(content):
+        # Both header formats start with "##"; skip the regexes otherwise
+        if not line.startswith("##"):
+            if current_section is not None:
+                current_content.append(line)
+            continue
+
+        match = _HEADER_RE.match(line)
 
-        if match_full or match_short:
+        if match:
             # Save previous section if exists
             if current_section:
-                current_section.content = "\n".join(current_content).strip()
-                current_section.note_links = extract_note_links(
-                    current_section.content
+                current_section.content = "".join(current_content).strip()
+                current_section.note_links = sorted(
+                    extract_note_links(current_section.content)
                 )
                 sections.append(current_section)
 
-            if match_full:
+            if match.group("pid") is None:
                 # Full format: ## @P 会社名/プロジェクト名
-                company_name = match_full.group(1).strip()
-                project_name = match_full.group(2).strip()
+                company_name = match.group("company").strip()
+                project_name = match.group("project").strip()
                 current_section = ProjectSection(
                     company_name=company_name,
                     project_name=project_name,
@@ -88,7 +96,7 @@ def parse_weekly_report(
                 )
             else:
                 # Short format: ## @P{ID}
-                project_id = int(match_short.group(1))
+                project_id = int(match.group("pid"))
                 current_section = ProjectSection(
                     company_name="",
                     project_name="",
@@ -105,8 +113,10 @@ def parse_weekly_report(
 
     # Save last section
     if current_section:
-        current_section.content = "\n".join(current_content).strip()
-        current_section.note_links = extract_note_links(current_section.content)
+        current_section.content = "".join(current_content).strip()
+        current_section.note_links = sorted(
+            extract_note_links(current_section.content)
+        )
         sections.append(current_section)
 
     return sections
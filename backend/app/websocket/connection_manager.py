@@ -1,6 +1,8 @@
 """WebSocket Connection Manager for real-time collaboration."""
 
+import asyncio
 import json
+import time
 from typing import Dict, List, Set, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -8,6 +10,9 @@ from uuid import UUID
 
 from fastapi import WebSocket
 
+# Minimum seconds between cursor broadcasts of one user (30 per second)
+CURSOR_BROADCAST_INTERVAL = 1 / 30
+
 
 @dataclass
 class Collaborator:
@@ -20,17 +25,24 @@ class Collaborator:
     cursor_x: Optional[float] = None
     cursor_y: Optional[float] = None
     connected_at: datetime = field(default_factory=datetime.now)
-    last_activity: datetime = field(default_factory=datetime.now)
+    # time.monotonic() of the last cursor update; cheap on the hot path
+    last_activity: float = field(default_factory=time.monotonic)
+    # Event loop time of the last cursor broadcast
+    last_cursor_broadcast: float = float("-inf")
+    # Pending broadcast of the latest cursor position, if throttled
+    cursor_flush: Optional[asyncio.Task] = None
 
 
 class ConnectionManager:
     """Manages WebSocket connections for real-time collaboration."""
 
     def __init__(self) -> None:
-        # drawing_id -> list of collaborators
-        self._rooms: Dict[str, List[Collaborator]] = {}
+        # drawing_id -> {websocket: collaborator}
+        self._rooms: Dict[str, Dict[WebSocket, Collaborator]] = {}
         # websocket -> (drawing_id, collaborator)
         self._connections: Dict[WebSocket, tuple[str, Collaborator]] = {}
+        # drawing_id -> collaborator list, dropped whenever the room changes
+        self._room_collaborators: Dict[str, List[dict]] = {}
 
     async def connect(
         self,
@@ -51,9 +63,8 @@ class ConnectionManager:
         )
 
         # Add to room
-        if drawing_id not in self._rooms:
-            self._rooms[drawing_id] = []
-        self._rooms[drawing_id].append(collaborator)
+        self._rooms.setdefault(drawing_id, {})[websocket] = collaborator
+        self._room_collaborators.pop(drawing_id, None)
 
         # Track connection
         self._connections[websocket] = (drawing_id, collaborator)
@@ -69,12 +80,13 @@ class ConnectionManager:
             return
 
         drawing_id, collaborator = self._connections[websocket]
+        if collaborator.cursor_flush is not None:
+            collaborator.cursor_flush.cancel()
 
         # Remove from room
+        self._room_collaborators.pop(drawing_id, None)
         if drawing_id in self._rooms:
-            self._rooms[drawing_id] = [
-                c for c in self._rooms[drawing_id] if c.websocket != websocket
-            ]
+            self._rooms[drawing_id].pop(websocket, None)
             # Clean up empty rooms
             if not self._rooms[drawing_id]:
                 del self._rooms[drawing_id]
@@ -95,18 +107,25 @@ class ConnectionManager:
         if drawing_id not in self._rooms:
             return
 
-        disconnected = []
-        for collaborator in self._rooms[drawing_id]:
-            if exclude and collaborator.websocket == exclude:
-                continue
-            try:
-                await collaborator.websocket.send_json(message)
-            except Exception:
-                disconnected.append(collaborator.websocket)
+        # Encode once for all recipients, the way send_json would
+        payload = json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+        # Send to everyone at once so one slow client does not delay the
+        # others; the room is copied as it may change while awaiting.
+        targets = [
+            websocket
+            for websocket in self._rooms[drawing_id]
+            if websocket != exclude
+        ]
+        results = await asyncio.gather(
+            *(websocket.send_text(payload) for websocket in targets),
+            return_exceptions=True,
+        )
 
         # Clean up disconnected clients
-        for ws in disconnected:
-            await self.disconnect(ws)
+        for websocket, result in zip(targets, results):
+            if isinstance(result, Exception):
+                await self.disconnect(websocket)
 
     async def send_to_user(self, websocket: WebSocket, message: dict) -> None:
         """Send a message to a specific user."""
@@ -116,11 +135,19 @@ class ConnectionManager:
             await self.disconnect(websocket)
 
     def get_room_collaborators(self, drawing_id: str) -> List[dict]:
-        """Get list of collaborators in a room."""
+        """Get list of collaborators in a room.
+
+        The list is cached until the room or a cursor in it changes, and
+        shared between callers; it must not be modified.
+        """
         if drawing_id not in self._rooms:
             return []
 
-        return [
+        cached = self._room_collaborators.get(drawing_id)
+        if cached is not None:
+            return cached
+
+        collaborators = [
             {
                 "user_id": c.user_id,
                 "user_name": c.user_name,
@@ -128,12 +155,14 @@ class ConnectionManager:
                 "cursor_x": c.cursor_x,
                 "cursor_y": c.cursor_y,
             }
-            for c in self._rooms[drawing_id]
+            for c in self._rooms[drawing_id].values()
         ]
+        self._room_collaborators[drawing_id] = collaborators
+        return collaborators
 
     def get_room_count(self, drawing_id: str) -> int:
         """Get number of users in a room."""
-        return len(self._rooms.get(drawing_id, []))
+        return len(self._rooms.get(drawing_id, {}))
 
     def update_cursor(
         self,
@@ -145,12 +174,73 @@ class ConnectionManager:
         if websocket not in self._connections:
             return None
 
-        _, collaborator = self._connections[websocket]
+        drawing_id, collaborator = self._connections[websocket]
         collaborator.cursor_x = x
         collaborator.cursor_y = y
-        collaborator.last_activity = datetime.now()
+        self._room_collaborators.pop(drawing_id, None)
+        collaborator.last_activity = time.monotonic()
         return collaborator
 
+    async def broadcast_cursor(self, websocket: WebSocket) -> None:
+        """Broadcast a user's cursor position to the others in the room.
+
+        Sends at most once per CURSOR_BROADCAST_INTERVAL per user. Moves
+        within the interval are coalesced: the latest position is sent
+        when the interval has passed, so the final position is never lost.
+        """
+        if websocket not in self._connections:
+            return
+
+        drawing_id, collaborator = self._connections[websocket]
+        if collaborator.cursor_flush is not None:
+            # The pending broadcast will pick up the latest position
+            return
+
+        delay = (
+            collaborator.last_cursor_broadcast
+            + CURSOR_BROADCAST_INTERVAL
+            - asyncio.get_running_loop().time()
+        )
+        if delay > 0:
+            collaborator.cursor_flush = asyncio.create_task(
+                self._flush_cursor(drawing_id, collaborator, delay)
+            )
+            return
+
+        await self._send_cursor(drawing_id, collaborator)
+
+    async def _flush_cursor(
+        self,
+        drawing_id: str,
+        collaborator: Collaborator,
+        delay: float,
+    ) -> None:
+        """Broadcast the latest cursor position after a delay."""
+        await asyncio.sleep(delay)
+        collaborator.cursor_flush = None
+        await self._send_cursor(drawing_id, collaborator)
+
+    async def _send_cursor(
+        self,
+        drawing_id: str,
+        collaborator: Collaborator,
+    ) -> None:
+        """Broadcast a user's current cursor position."""
+        collaborator.last_cursor_broadcast = asyncio.get_running_loop().time()
+        message = {
+            "type": "cursor_move",
+            "data": {
+                "user_id": collaborator.user_id,
+                "user_name": collaborator.user_name,
+                "user_color": collaborator.user_color,
+                "x": collaborator.cursor_x,
+                "y": collaborator.cursor_y,
+            },
+        }
+        await self.broadcast_to_room(
+            drawing_id, message, exclude=collaborator.websocket
+        )
+
     async def _broadcast_user_joined(
         self,
         drawing_id: str,
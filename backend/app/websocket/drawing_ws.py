@@ -1,16 +1,19 @@
 """WebSocket endpoint for real-time drawing collaboration."""
 
 import json
+import os
+import random
 import secrets
-from typing import Optional
+from typing import Any, Awaitable, Callable, Dict, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query, Depends
 from sqlalchemy.orm import Session
 
+from app.core.logging import log_error
 from app.db.session import get_db
 from app.services.drawing_service import DrawingService
-from app.websocket.connection_manager import manager
+from app.websocket.connection_manager import Collaborator, manager
 
 router = APIRouter()
 
@@ -29,9 +32,181 @@ COLLABORATOR_COLORS = [
 ]
 
 
+# Display colors need no cryptographic randomness
+_color_rng = random.Random(os.urandom(16))
+
+
 def get_random_color() -> str:
     """Get a random collaborator color."""
-    return secrets.choice(COLLABORATOR_COLORS)
+    return COLLABORATOR_COLORS[_color_rng.randrange(len(COLLABORATOR_COLORS))]
+
+
+# (websocket, drawing_id, sender, received message) -> None
+MessageHandler = Callable[
+    [WebSocket, str, Collaborator, Dict[str, Any]], Awaitable[None]
+]
+
+
+async def _handle_cursor_move(
+    websocket: WebSocket,
+    drawing_id: str,
+    collaborator: Collaborator,
+    data: Dict[str, Any],
+) -> None:
+    """Update the cursor position and broadcast it to others (throttled)."""
+    manager.update_cursor(websocket, data.get("x", 0), data.get("y", 0))
+    await manager.broadcast_cursor(websocket)
+
+
+async def _handle_shape_add(
+    websocket: WebSocket,
+    drawing_id: str,
+    collaborator: Collaborator,
+    data: Dict[str, Any],
+) -> None:
+    """Broadcast a new shape to others."""
+    await manager.broadcast_to_room(
+        drawing_id,
+        {
+            "type": "shape_add",
+            "data": {
+                "shape": data.get("shape"),
+                "user_id": collaborator.user_id,
+                "user_name": collaborator.user_name,
+            },
+        },
+        exclude=websocket,
+    )
+
+
+async def _handle_shape_update(
+    websocket: WebSocket,
+    drawing_id: str,
+    collaborator: Collaborator,
+    data: Dict[str, Any],
+) -> None:
+    """Broadcast a shape update to others."""
+    await manager.broadcast_to_room(
+        drawing_id,
+        {
+            "type": "shape_update",
+            "data": {
+                "shape_id": data.get("shape_id"),
+                "changes": data.get("changes"),
+                "user_id": collaborator.user_id,
+                "user_name": collaborator.user_name,
+            },
+        },
+        exclude=websocket,
+    )
+
+
+async def _handle_shape_delete(
+    websocket: WebSocket,
+    drawing_id: str,
+    collaborator: Collaborator,
+    data: Dict[str, Any],
+) -> None:
+    """Broadcast a shape deletion to others."""
+    await manager.broadcast_to_room(
+        drawing_id,
+        {
+            "type": "shape_delete",
+            "data": {
+                "shape_ids": data.get("shape_ids", []),
+                "user_id": collaborator.user_id,
+                "user_name": collaborator.user_name,
+            },
+        },
+        exclude=websocket,
+    )
+
+
+async def _handle_shapes_sync(
+    websocket: WebSocket,
+    drawing_id: str,
+    collaborator: Collaborator,
+    data: Dict[str, Any],
+) -> None:
+    """Full sync - broadcast all shapes to others."""
+    await manager.broadcast_to_room(
+        drawing_id,
+        {
+            "type": "shapes_sync",
+            "data": {
+                "shapes": data.get("shapes", []),
+                "user_id": collaborator.user_id,
+                "user_name": collaborator.user_name,
+            },
+        },
+        exclude=websocket,
+    )
+
+
+async def _handle_selection_change(
+    websocket: WebSocket,
+    drawing_id: str,
+    collaborator: Collaborator,
+    data: Dict[str, Any],
+) -> None:
+    """Broadcast a selection change to others."""
+    await manager.broadcast_to_room(
+        drawing_id,
+        {
+            "type": "selection_change",
+            "data": {
+                "selected_ids": data.get("selected_ids", []),
+                "user_id": collaborator.user_id,
+                "user_name": collaborator.user_name,
+                "user_color": collaborator.user_color,
+            },
+        },
+        exclude=websocket,
+    )
+
+
+async def _handle_chat(
+    websocket: WebSocket,
+    drawing_id: str,
+    collaborator: Collaborator,
+    data: Dict[str, Any],
+) -> None:
+    """Broadcast a chat message to all including the sender."""
+    await manager.broadcast_to_room(
+        drawing_id,
+        {
+            "type": "chat",
+            "data": {
+                "message": data.get("message", ""),
+                "user_id": collaborator.user_id,
+                "user_name": collaborator.user_name,
+                "user_color": collaborator.user_color,
+            },
+        },
+    )
+
+
+async def _handle_ping(
+    websocket: WebSocket,
+    drawing_id: str,
+    collaborator: Collaborator,
+    data: Dict[str, Any],
+) -> None:
+    """Respond to a ping."""
+    await manager.send_to_user(websocket, {"type": "pong"})
+
+
+# Message type -> handler; messages of other types are ignored
+MESSAGE_HANDLERS: Dict[str, MessageHandler] = {
+    "cursor_move": _handle_cursor_move,
+    "shape_add": _handle_shape_add,
+    "shape_update": _handle_shape_update,
+    "shape_delete": _handle_shape_delete,
+    "shapes_sync": _handle_shapes_sync,
+    "selection_change": _handle_selection_change,
+    "chat": _handle_chat,
+    "ping": _handle_ping,
+}
 
 
 @router.websocket("/ws/drawing/{drawing_id}")
@@ -84,130 +259,16 @@ async def drawing_websocket(
             # Receive message
             data = await websocket.receive_json()
             message_type = data.get("type")
-
-            if message_type == "cursor_move":
-                # Update cursor position
-                x = data.get("x", 0)
-                y = data.get("y", 0)
-                manager.update_cursor(websocket, x, y)
-
-                # Broadcast cursor position to others
-                await manager.broadcast_to_room(
-                    drawing_id,
-                    {
-                        "type": "cursor_move",
-                        "data": {
-                            "user_id": user_id,
-                            "user_name": user_name,
-                            "user_color": user_color,
-                            "x": x,
-                            "y": y,
-                        },
-                    },
-                    exclude=websocket,
-                )
-
-            elif message_type == "shape_add":
-                # Broadcast new shape to others
-                await manager.broadcast_to_room(
-                    drawing_id,
-                    {
-                        "type": "shape_add",
-                        "data": {
-                            "shape": data.get("shape"),
-                            "user_id": user_id,
-                            "user_name": user_name,
-                        },
-                    },
-                    exclude=websocket,
-                )
-
-            elif message_type == "shape_update":
-                # Broadcast shape update to others
-                await manager.broadcast_to_room(
-                    drawing_id,
-                    {
-                        "type": "shape_update",
-                        "data": {
-                            "shape_id": data.get("shape_id"),
-                            "changes": data.get("changes"),
-                            "user_id": user_id,
-                            "user_name": user_name,
-                        },
-                    },
-                    exclude=websocket,
-                )
-
-            elif message_type == "shape_delete":
-                # Broadcast shape deletion to others
-                await manager.broadcast_to_room(
-                    drawing_id,
-                    {
-                        "type": "shape_delete",
-                        "data": {
-                            "shape_ids": data.get("shape_ids", []),
-                            "user_id": user_id,
-                            "user_name": user_name,
-                        },
-                    },
-                    exclude=websocket,
-                )
-
-            elif message_type == "shapes_sync":
-                # Full sync - broadcast all shapes
-                await manager.broadcast_to_room(
-                    drawing_id,
-                    {
-                        "type": "shapes_sync",
-                        "data": {
-                            "shapes": data.get("shapes", []),
-                            "user_id": user_id,
-                            "user_name": user_name,
-                        },
-                    },
-                    exclude=websocket,
-                )
-
-            elif message_type == "selection_change":
-                # Broadcast selection change
-                await manager.broadcast_to_room(
-                    drawing_id,
-                    {
-                        "type": "selection_change",
-                        "data": {
-                            "selected_ids": data.get("selected_ids", []),
-                            "user_id": user_id,
-                            "user_name": user_name,
-                            "user_color": user_color,
-                        },
-                    },
-                    exclude=websocket,
-                )
-
-            elif message_type == "chat":
-                # Broadcast chat message to all including sender
-                await manager.broadcast_to_room(
-                    drawing_id,
-                    {
-                        "type": "chat",
-                        "data": {
-                            "message": data.get("message", ""),
-                            "user_id": user_id,
-                            "user_name": user_name,
-                            "user_color": user_color,
-                        },
-                    },
-                )
-
-            elif message_type == "ping":
-                # Respond to ping
-                await manager.send_to_user(
-                    websocket,
-                    {"type": "pong"},
-                )
+            handler = (
+                MESSAGE_HANDLERS.get(message_type)
+                if isinstance(message_type, str)
+                else None
+            )
+            if handler is not None:
+                await handler(websocket, drawing_id, collaborator, data)
 
     except WebSocketDisconnect:
         await manager.disconnect(websocket)
     except Exception as e:
-        print(f"WebSocket error: {e}")
+        log_error(f"WebSocket error in drawing {drawing_id}: {e}")
         await manager.disconnect(websocket)
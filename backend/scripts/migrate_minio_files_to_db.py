@@ -15,15 +15,25 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import mimetypes
 from datetime import datetime
 
+from sqlalchemy import select
+
 from app.db.session import SessionLocal
 from app.models.file import File
 from app.utils.s3 import get_minio_client
 
+# Number of file records inserted per commit
+BATCH_SIZE = 1000
+
+
+# Extension -> MIME type, including the system's mime.types entries
+mimetypes.init()
+_EXT_MAP = dict(mimetypes.types_map)
+
 
 def guess_mime_type(filename: str) -> str:
     """Guess MIME type from filename."""
-    content_type, _ = mimetypes.guess_type(filename)
-    return content_type or "application/octet-stream"
+    ext = os.path.splitext(filename)[1].lower()
+    return _EXT_MAP.get(ext, "application/octet-stream")
 
 
 def get_original_name(key: str) -> str:
@@ -38,18 +48,36 @@ def migrate_files():
     db = SessionLocal()
 
     try:
-        # Get all existing stored_keys from DB
+        # Get all existing stored_keys from DB, fetched in chunks
         existing_keys = set(
-            row[0] for row in db.query(File.stored_key).all()
+            db.scalars(
+                select(File.stored_key).execution_options(yield_per=BATCH_SIZE)
+            )
         )
         print(f"既存のDBレコード数: {len(existing_keys)}")
 
-        # List all objects in MinIO bucket
+        # List all objects in MinIO bucket. The listing already carries the
+        # size and modification time, so no per-object stat is needed.
         objects = minio.client.list_objects(minio.bucket, recursive=True)
 
         added_count = 0
         skipped_count = 0
         error_count = 0
+        pending: list[File] = []
+
+        def flush() -> None:
+            """Insert the pending records in one commit."""
+            nonlocal added_count, error_count
+            try:
+                db.bulk_save_objects(pending)
+                db.commit()
+                added_count += len(pending)
+                print(f"進捗: {added_count} 件追加")
+            except Exception as e:
+                error_count += len(pending)
+                print(f"エラー: {len(pending)} 件の登録に失敗 - {e}")
+                db.rollback()
+            pending.clear()
 
         for obj in objects:
             key = obj.object_name
@@ -59,34 +87,25 @@ def migrate_files():
                 skipped_count += 1
                 continue
 
-            try:
-                # Get file info from MinIO
-                stat = minio.client.stat_object(minio.bucket, key)
-
-                # Create file record
-                original_name = get_original_name(key)
-                mime_type = stat.content_type or guess_mime_type(original_name)
-                size_bytes = stat.size
-                created_at = stat.last_modified or datetime.now()
-
-                file = File(
-                    original_name=original_name,
-                    stored_key=key,
-                    mime_type=mime_type,
-                    size_bytes=size_bytes,
-                    created_at=created_at,
-                )
-
-                db.add(file)
-                db.commit()
-
-                added_count += 1
-                print(f"追加: {key} ({mime_type}, {size_bytes} bytes)")
-
-            except Exception as e:
-                error_count += 1
-                print(f"エラー: {key} - {e}")
-                db.rollback()
+            # Create file record
+            original_name = get_original_name(key)
+            mime_type = guess_mime_type(original_name)
+            size_bytes = obj.size
+            created_at = obj.last_modified or datetime.now()
+
+            pending.append(File(
+                original_name=original_name,
+                stored_key=key,
+                mime_type=mime_type,
+                size_bytes=size_bytes,
+                created_at=created_at,
+            ))
+
+            if len(pending) >= BATCH_SIZE:
+                flush()
+
+        if pending:
+            flush()
 
         print(f"\n=== 結果 ===")
         print(f"追加: {added_count} 件")
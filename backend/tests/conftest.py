@@ -9,12 +9,11 @@ from pathlib import Path
 _project_root = Path(__file__).parent.parent.parent
 _env_file = _project_root / ".env"
 if _env_file.exists():
-    with open(_env_file) as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith("#") and "=" in line:
-                key, value = line.split("=", 1)
-                os.environ.setdefault(key.strip(), value.strip())
+    for line in _env_file.read_text().splitlines():
+        line = line.strip()
+        if line and line[0] != "#" and "=" in line:
+            key, value = line.split("=", 1)
+            os.environ.setdefault(key.strip(), value.strip())
 
 # Override for test environment
 os.environ["APP_ENV"] = "test"
@@ -36,15 +35,19 @@ os.environ.setdefault("ASK_ENABLED", "false")
 import pytest
 from typing import Generator
 from unittest.mock import MagicMock, patch
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
 
 # Create a mock for the Minio client from minio library
 mock_minio_lib = MagicMock()
 mock_minio_lib.bucket_exists.return_value = True
-mock_minio_lib.get_object.return_value = MagicMock(read=lambda: b"mock file content")
+mock_minio_lib.get_object.return_value = MagicMock(
+    read=lambda: b"mock file content",
+    stream=lambda amt=None: iter([b"mock file content"]),
+)
 mock_minio_lib.put_object.return_value = None
 mock_minio_lib.remove_object.return_value = None
 mock_minio_lib.stat_object.return_value = MagicMock()
@@ -54,16 +57,26 @@ mock_minio_lib.presigned_get_object.return_value = "http://mock-url"
 _minio_lib_patch = patch("minio.Minio", return_value=mock_minio_lib)
 _minio_lib_patch.start()
 
+from app import models  # noqa: F401  (registers every table on Base)
 from app.db.base import Base
 from app.db.session import get_db
-from app.main import app
+from app.services.settings_service import invalidate_settings_cache
+
 
+# Named shared-cache in-memory database: unlike ":memory:", every
+# connection opened to it sees the same data. Named per xdist worker so
+# parallel workers do not share it.
+_worker_id = os.environ.get("PYTEST_XDIST_WORKER", "main")
+TEST_DATABASE_URL = (
+    f"sqlite+pysqlite:///file:notedock_test_{_worker_id}"
+    "?mode=memory&cache=shared&uri=true"
+)
 
 # Create test database engine
 test_engine = create_engine(
-    "sqlite:///:memory:",
+    TEST_DATABASE_URL,
     connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
+    poolclass=NullPool,
 )
 
 TestSessionLocal = sessionmaker(
@@ -73,24 +86,77 @@ TestSessionLocal = sessionmaker(
 )
 
 
-@pytest.fixture(scope="function")
-def db() -> Generator[Session, None, None]:
-    """Create a fresh database for each test."""
-    # Create all tables
-    Base.metadata.create_all(bind=test_engine)
+# pysqlite issues its own BEGIN and breaks SAVEPOINT semantics; let
+# SQLAlchemy emit BEGIN instead so each test can run in a savepoint.
+@event.listens_for(test_engine, "connect")
+def _disable_pysqlite_begin(dbapi_connection, connection_record) -> None:  # type: ignore[no-untyped-def]
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(test_engine, "begin")
+def _emit_begin(conn) -> None:  # type: ignore[no-untyped-def]
+    conn.exec_driver_sql("BEGIN")
 
-    session = TestSessionLocal()
+
+@pytest.fixture(scope="session")
+def _schema() -> Generator[None, None, None]:
+    """Create all tables once for the test session.
+
+    A shared in-memory database is discarded when its last connection
+    closes, so one connection is held open for the whole session.
+    """
+    with test_engine.connect() as keepalive:
+        Base.metadata.create_all(bind=keepalive)
+        keepalive.commit()
+        yield
+
+
+@pytest.fixture(scope="function")
+def db(_schema: None) -> Generator[Session, None, None]:
+    """Create a database session whose changes are undone after the test.
+
+    The test runs inside an outer transaction that is rolled back at the
+    end; commits made by the code under test only release savepoints.
+    """
+    connection = test_engine.connect()
+    transaction = connection.begin()
+    session = TestSessionLocal(
+        bind=connection, join_transaction_mode="create_savepoint"
+    )
     try:
         yield session
     finally:
         session.close()
-        # Drop all tables after each test
-        Base.metadata.drop_all(bind=test_engine)
+        transaction.rollback()
+        connection.close()
+        # Process-wide caches must not outlive the test data
+        invalidate_settings_cache()
+
+
+@pytest.fixture(scope="session")
+def app() -> FastAPI:
+    """Get the FastAPI app.
+
+    Imported on first use so that collecting or deselecting tests does
+    not assemble the app.
+    """
+    from app.main import app as fastapi_app
+
+    return fastapi_app
+
+
+@pytest.fixture(scope="session")
+def _app_client(app: FastAPI) -> Generator[TestClient, None, None]:
+    """Start the app once for the test session."""
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 @pytest.fixture(scope="function")
-def client(db: Session) -> Generator[TestClient, None, None]:
-    """Create a test client with database session override."""
+def client(
+    db: Session, app: FastAPI, _app_client: TestClient
+) -> Generator[TestClient, None, None]:
+    """Get the test client with database session override."""
     def override_get_db() -> Generator[Session, None, None]:
         try:
             yield db
@@ -99,10 +165,19 @@ def client(db: Session) -> Generator[TestClient, None, None]:
 
     app.dependency_overrides[get_db] = override_get_db
 
-    with TestClient(app) as test_client:
-        yield test_client
+    yield _app_client
+
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture(scope="session")
+def no_db_client(_app_client: TestClient) -> TestClient:
+    """Get the test client for endpoints that never touch the database.
 
-    app.dependency_overrides.clear()
+    No test session is set up; a request that does reach the database
+    fails against the app's own empty one.
+    """
+    return _app_client
 
 
 @pytest.fixture
@@ -1,238 +1,252 @@
 """Tests for AI API endpoints."""
 
+from typing import Any, Dict, Generator
+
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock, patch
 
-from app.main import app
+from app.api.v1.ai import get_note_service, get_project_service, get_tag_repo
 from app.schemas.ai import StreamEvent
 
+# Streamed events are immutable in these tests, so they are built once
+GENERATE_EVENTS = (
+    StreamEvent(type="add_message_token", token="Hello"),
+    StreamEvent(type="add_message_token", token=" World"),
+    StreamEvent(type="add_bot_message_id", id="123"),
+)
+IMPROVED_EVENT = StreamEvent(type="add_message_token", token="Improved")
+TRANSLATED_EVENT = StreamEvent(type="add_message_token", token="Translated")
+
+
+@pytest.fixture(autouse=True)
+def mock_ask_service(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Replace the AskService used by the AI endpoints with a mock."""
+    service = MagicMock()
+    monkeypatch.setattr("app.api.v1.ai.get_ask_service", lambda: service)
+    return service
+
+
+@pytest.fixture
+def mock_note_service(app: FastAPI) -> Generator[MagicMock, None, None]:
+    """Override the NoteService dependency with a mock."""
+    service = MagicMock()
+    app.dependency_overrides[get_note_service] = lambda: service
+    yield service
+    app.dependency_overrides.pop(get_note_service, None)
+
+
+@pytest.fixture
+def mock_tag_repo(app: FastAPI) -> Generator[MagicMock, None, None]:
+    """Override the TagRepository dependency with a mock."""
+    repo = MagicMock()
+    app.dependency_overrides[get_tag_repo] = lambda: repo
+    yield repo
+    app.dependency_overrides.pop(get_tag_repo, None)
 
-client = TestClient(app)
+
+@pytest.fixture
+def mock_project_service(app: FastAPI) -> Generator[MagicMock, None, None]:
+    """Override the ProjectService dependency with a mock."""
+    service = MagicMock()
+    app.dependency_overrides[get_project_service] = lambda: service
+    yield service
+    app.dependency_overrides.pop(get_project_service, None)
 
 
 class TestAIStatusEndpoint:
     """Tests for GET /api/ai/status endpoint."""
 
-    def test_status_when_disabled(self) -> None:
+    def test_status_when_disabled(
+        self,
+        no_db_client: TestClient,
+        mock_ask_service: MagicMock,
+    ) -> None:
         """Test status endpoint when AI is disabled."""
-        with patch("app.api.v1.ai.get_ask_service") as mock_get_service:
-            mock_service = MagicMock()
-            mock_service._is_enabled.return_value = False
-            mock_service.default_model = "gpt-4o-mini"
-            mock_get_service.return_value = mock_service
+        mock_ask_service._is_enabled.return_value = False
+        mock_ask_service.default_model = "gpt-4o-mini"
 
-            response = client.get("/api/ai/status")
+        response = no_db_client.get("/api/ai/status")
 
-            assert response.status_code == 200
-            data = response.json()
-            assert data["enabled"] is False
-            assert data["defaultModel"] == "gpt-4o-mini"
+        assert response.status_code == 200
+        data = response.json()
+        assert data["enabled"] is False
+        assert data["defaultModel"] == "gpt-4o-mini"
 
-    def test_status_when_enabled(self) -> None:
+    def test_status_when_enabled(
+        self,
+        no_db_client: TestClient,
+        mock_ask_service: MagicMock,
+    ) -> None:
         """Test status endpoint when AI is enabled."""
-        with patch("app.api.v1.ai.get_ask_service") as mock_get_service:
-            mock_service = MagicMock()
-            mock_service._is_enabled.return_value = True
-            mock_service.default_model = "claude-3-5-sonnet"
-            mock_get_service.return_value = mock_service
+        mock_ask_service._is_enabled.return_value = True
+        mock_ask_service.default_model = "claude-3-5-sonnet"
 
-            response = client.get("/api/ai/status")
+        response = no_db_client.get("/api/ai/status")
 
-            assert response.status_code == 200
-            data = response.json()
-            assert data["enabled"] is True
-            assert data["defaultModel"] == "claude-3-5-sonnet"
+        assert response.status_code == 200
+        data = response.json()
+        assert data["enabled"] is True
+        assert data["defaultModel"] == "claude-3-5-sonnet"
 
 
-class TestAIGenerateEndpoint:
-    """Tests for POST /api/ai/generate endpoint."""
+class TestAIEndpointsWhenDisabled:
+    """Tests for the AI endpoints that require AI to be enabled."""
 
-    def test_generate_when_disabled(self) -> None:
-        """Test generate endpoint when AI is disabled."""
-        with patch("app.api.v1.ai.get_ask_service") as mock_get_service:
-            mock_service = MagicMock()
-            mock_service._is_enabled.return_value = False
-            mock_get_service.return_value = mock_service
+    @pytest.mark.parametrize(
+        ("url", "request_kwargs"),
+        [
+            ("/api/ai/generate", {"json": {"prompt": "Write a test article"}}),
+            ("/api/ai/assist", {"json": {"content": "Some text", "mode": "improve"}}),
+            ("/api/ai/summarize", {"json": {"noteId": 1}}),
+            (
+                "/api/ai/ask",
+                {"json": {"noteId": 1, "question": "What is this about?"}},
+            ),
+            (
+                "/api/ai/suggest-tags",
+                {"json": {"title": "Test", "content": "Test content"}},
+            ),
+            (
+                "/api/ai/project/ask",
+                {"json": {"projectId": 1, "question": "What is this project about?"}},
+            ),
+            (
+                "/api/ai/upload-file",
+                {
+                    "files": {"file": ("test.txt", b"test content", "text/plain")},
+                    "data": {"chat_id": "test-chat-id"},
+                },
+            ),
+        ],
+    )
+    def test_returns_503_when_disabled(
+        self,
+        no_db_client: TestClient,
+        mock_ask_service: MagicMock,
+        url: str,
+        request_kwargs: Dict[str, Any],
+    ) -> None:
+        """Test that each endpoint is rejected while AI is disabled."""
+        mock_ask_service._is_enabled.return_value = False
 
-            response = client.post(
-                "/api/ai/generate",
-                json={"prompt": "Write a test article"},
-            )
+        response = no_db_client.post(url, **request_kwargs)
+
+        assert response.status_code == 503
+        assert "not enabled" in response.json()["detail"]
 
-            assert response.status_code == 503
-            assert "not enabled" in response.json()["detail"]
 
-    def test_generate_success(self) -> None:
+class TestAIGenerateEndpoint:
+    """Tests for POST /api/ai/generate endpoint."""
+
+    def test_generate_success(
+        self,
+        no_db_client: TestClient,
+        mock_ask_service: MagicMock,
+    ) -> None:
         """Test generate endpoint with successful streaming response."""
-        with patch("app.api.v1.ai.get_ask_service") as mock_get_service:
-            mock_service = MagicMock()
-            mock_service._is_enabled.return_value = True
+        mock_ask_service._is_enabled.return_value = True
 
-            async def mock_chat(*args, **kwargs):
-                yield StreamEvent(type="add_message_token", token="Hello")
-                yield StreamEvent(type="add_message_token", token=" World")
-                yield StreamEvent(type="add_bot_message_id", id="123")
+        async def mock_chat(*args, **kwargs):
+            for event in GENERATE_EVENTS:
+                yield event
 
-            mock_service.chat = mock_chat
-            mock_get_service.return_value = mock_service
+        mock_ask_service.chat = mock_chat
 
-            response = client.post(
-                "/api/ai/generate",
-                json={"prompt": "Test prompt"},
-            )
+        response = no_db_client.post(
+            "/api/ai/generate",
+            json={"prompt": "Test prompt"},
+        )
 
-            assert response.status_code == 200
-            assert response.headers["content-type"] == "application/x-ndjson"
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
 
-            lines = response.text.strip().split("\n")
-            assert len(lines) == 3
+        lines = list(response.iter_lines())
+        assert len(lines) == 3
 
 
 class TestAIAssistEndpoint:
     """Tests for POST /api/ai/assist endpoint."""
 
-    def test_assist_when_disabled(self) -> None:
-        """Test assist endpoint when AI is disabled."""
-        with patch("app.api.v1.ai.get_ask_service") as mock_get_service:
-            mock_service = MagicMock()
-            mock_service._is_enabled.return_value = False
-            mock_get_service.return_value = mock_service
-
-            response = client.post(
-                "/api/ai/assist",
-                json={"content": "Some text", "mode": "improve"},
-            )
-
-            assert response.status_code == 503
-            assert "not enabled" in response.json()["detail"]
-
-    def test_assist_improve_mode(self) -> None:
+    def test_assist_improve_mode(
+        self,
+        no_db_client: TestClient,
+        mock_ask_service: MagicMock,
+    ) -> None:
         """Test assist endpoint with improve mode."""
-        with patch("app.api.v1.ai.get_ask_service") as mock_get_service:
-            mock_service = MagicMock()
-            mock_service._is_enabled.return_value = True
+        mock_ask_service._is_enabled.return_value = True
 
-            async def mock_chat(*args, **kwargs):
-                yield StreamEvent(type="add_message_token", token="Improved")
+        async def mock_chat(*args, **kwargs):
+            yield IMPROVED_EVENT
 
-            mock_service.chat = mock_chat
-            mock_get_service.return_value = mock_service
+        mock_ask_service.chat = mock_chat
 
-            response = client.post(
-                "/api/ai/assist",
-                json={"content": "Fix this", "mode": "improve"},
-            )
+        response = no_db_client.post(
+            "/api/ai/assist",
+            json={"content": "Fix this", "mode": "improve"},
+        )
 
-            assert response.status_code == 200
+        assert response.status_code == 200
 
-    def test_assist_translate_mode(self) -> None:
+    def test_assist_translate_mode(
+        self,
+        no_db_client: TestClient,
+        mock_ask_service: MagicMock,
+    ) -> None:
         """Test assist endpoint with translate mode."""
-        with patch("app.api.v1.ai.get_ask_service") as mock_get_service:
-            mock_service = MagicMock()
-            mock_service._is_enabled.return_value = True
-
-            async def mock_chat(*args, **kwargs):
-                yield StreamEvent(type="add_message_token", token="Translated")
-
-            mock_service.chat = mock_chat
-            mock_get_service.return_value = mock_service
-
-            response = client.post(
-                "/api/ai/assist",
-                json={
-                    "content": "Hello",
-                    "mode": "translate",
-                    "targetLanguage": "Japanese",
-                },
-            )
+        mock_ask_service._is_enabled.return_value = True
 
-            assert response.status_code == 200
+        async def mock_chat(*args, **kwargs):
+            yield TRANSLATED_EVENT
 
+        mock_ask_service.chat = mock_chat
 
-class TestAISummarizeEndpoint:
-    """Tests for POST /api/ai/summarize endpoint."""
+        response = no_db_client.post(
+            "/api/ai/assist",
+            json={
+                "content": "Hello",
+                "mode": "translate",
+                "targetLanguage": "Japanese",
+            },
+        )
 
-    def test_summarize_when_disabled(self) -> None:
-        """Test summarize endpoint when AI is disabled."""
-        with patch("app.api.v1.ai.get_ask_service") as mock_get_service:
-            mock_service = MagicMock()
-            mock_service._is_enabled.return_value = False
-            mock_get_service.return_value = mock_service
+        assert response.status_code == 200
 
-            response = client.post(
-                "/api/ai/summarize",
-                json={"noteId": 1},
-            )
 
-            assert response.status_code == 503
-            assert "not enabled" in response.json()["detail"]
+class TestAISummarizeEndpoint:
+    """Tests for POST /api/ai/summarize endpoint."""
 
-    def test_summarize_note_not_found(self) -> None:
+    def test_summarize_note_not_found(
+        self,
+        no_db_client: TestClient,
+        mock_ask_service: MagicMock,
+        mock_note_service: MagicMock,
+    ) -> None:
         """Test summarize endpoint when note not found."""
-        with (
-            patch("app.api.v1.ai.get_ask_service") as mock_get_service,
-            patch("app.api.v1.ai.get_note_service") as mock_get_note_service,
-        ):
-            mock_ask_service = MagicMock()
-            mock_ask_service._is_enabled.return_value = True
-            mock_get_service.return_value = mock_ask_service
-
-            # Simulate note not found exception
-            from app.core.errors import NotFoundError
-
-            mock_note_service = MagicMock()
-            mock_note_service.get_note.side_effect = NotFoundError("Note", 999)
-            mock_get_note_service.return_value = mock_note_service
-
-            response = client.post(
-                "/api/ai/summarize",
-                json={"noteId": 999},
-            )
-
-            assert response.status_code == 404
+        mock_ask_service._is_enabled.return_value = True
 
+        # Simulate note not found exception
+        from app.core.errors import NotFoundError
 
-class TestAIAskEndpoint:
-    """Tests for POST /api/ai/ask endpoint."""
+        mock_note_service.get_note.side_effect = NotFoundError("Note", 999)
 
-    def test_ask_when_disabled(self) -> None:
-        """Test ask endpoint when AI is disabled."""
-        with patch("app.api.v1.ai.get_ask_service") as mock_get_service:
-            mock_service = MagicMock()
-            mock_service._is_enabled.return_value = False
-            mock_get_service.return_value = mock_service
-
-            response = client.post(
-                "/api/ai/ask",
-                json={"noteId": 1, "question": "What is this about?"},
-            )
+        response = no_db_client.post(
+            "/api/ai/summarize",
+            json={"noteId": 999},
+        )
 
-            assert response.status_code == 503
-            assert "not enabled" in response.json()["detail"]
+        assert response.status_code == 404
 
 
 class TestAISuggestTagsEndpoint:
     """Tests for POST /api/ai/suggest-tags endpoint."""
 
-    def test_suggest_tags_when_disabled(self) -> None:
-        """Test suggest-tags endpoint when AI is disabled."""
-        with patch("app.api.v1.ai.get_ask_service") as mock_get_service:
-            mock_service = MagicMock()
-            mock_service._is_enabled.return_value = False
-            mock_get_service.return_value = mock_service
-
-            response = client.post(
-                "/api/ai/suggest-tags",
-                json={"title": "Test", "content": "Test content"},
-            )
-
-            assert response.status_code == 503
-            assert "not enabled" in response.json()["detail"]
-
-    def test_suggest_tags_validation_error_empty_title(self) -> None:
+    def test_suggest_tags_validation_error_empty_title(
+        self, no_db_client: TestClient
+    ) -> None:
         """Test suggest-tags endpoint with empty title."""
-        response = client.post(
+        response = no_db_client.post(
             "/api/ai/suggest-tags",
             json={"title": "", "content": "Test content"},
         )
@@ -240,9 +254,11 @@ class TestAISuggestTagsEndpoint:
         # App uses custom error handling, returns 400 for validation errors
         assert response.status_code in (400, 422)
 
-    def test_suggest_tags_validation_error_empty_content(self) -> None:
+    def test_suggest_tags_validation_error_empty_content(
+        self, no_db_client: TestClient
+    ) -> None:
         """Test suggest-tags endpoint with empty content."""
-        response = client.post(
+        response = no_db_client.post(
             "/api/ai/suggest-tags",
             json={"title": "Test", "content": ""},
         )
@@ -250,9 +266,11 @@ class TestAISuggestTagsEndpoint:
         # App uses custom error handling, returns 400 for validation errors
         assert response.status_code in (400, 422)
 
-    def test_suggest_tags_max_suggestions_validation(self) -> None:
+    def test_suggest_tags_max_suggestions_validation(
+        self, no_db_client: TestClient
+    ) -> None:
         """Test suggest-tags endpoint with invalid maxSuggestions."""
-        response = client.post(
+        response = no_db_client.post(
             "/api/ai/suggest-tags",
             json={"title": "Test", "content": "Test content", "maxSuggestions": 15},
         )
@@ -260,209 +278,181 @@ class TestAISuggestTagsEndpoint:
         # App uses custom error handling, returns 400 for validation errors
         assert response.status_code in (400, 422)
 
-    def test_suggest_tags_success(self) -> None:
+    def test_suggest_tags_success(
+        self,
+        no_db_client: TestClient,
+        mock_ask_service: MagicMock,
+        mock_tag_repo: MagicMock,
+    ) -> None:
         """Test successful tag suggestion with existing and new tags."""
-        with (
-            patch("app.api.v1.ai.get_ask_service") as mock_get_service,
-            patch("app.api.v1.ai.get_tag_repo") as mock_get_tag_repo,
-        ):
-            mock_service = MagicMock()
-            mock_service._is_enabled.return_value = True
-
-            # Mock AI response
-            ai_response = '{"tags": [{"name": "Docker", "reason": "Dockerに関する内容"}, {"name": "Tips", "reason": "実用的なノウハウ"}]}'
-            mock_service.chat_simple = AsyncMock(return_value=(ai_response, None))
-            mock_get_service.return_value = mock_service
-
-            # Mock existing tags
-            mock_tag_repo = MagicMock()
-            mock_tag = MagicMock()
-            mock_tag.name = "Tips"
-            mock_tag_repo.get_all.return_value = [mock_tag]
-            mock_get_tag_repo.return_value = mock_tag_repo
-
-            response = client.post(
-                "/api/ai/suggest-tags",
-                json={
-                    "title": "Dockerの使い方",
-                    "content": "Docker networking tips",
-                    "maxSuggestions": 5,
-                },
-            )
+        mock_ask_service._is_enabled.return_value = True
 
-            assert response.status_code == 200
-            data = response.json()
-            assert "suggestions" in data
-            assert len(data["suggestions"]) == 2
+        # Mock AI response
+        ai_response = '{"tags": [{"name": "Docker", "reason": "Dockerに関する内容"}, {"name": "Tips", "reason": "実用的なノウハウ"}]}'
 
-            # Check first suggestion (new tag)
-            docker_tag = next((s for s in data["suggestions"] if s["name"] == "Docker"), None)
-            assert docker_tag is not None
-            assert docker_tag["isExisting"] is False
+        async def mock_chat_simple(*args, **kwargs):
+            return ai_response, None
 
-            # Check second suggestion (existing tag)
-            tips_tag = next((s for s in data["suggestions"] if s["name"] == "Tips"), None)
-            assert tips_tag is not None
-            assert tips_tag["isExisting"] is True
+        mock_ask_service.chat_simple = mock_chat_simple
 
-    def test_suggest_tags_invalid_json_returns_empty(self) -> None:
+        # Mock existing tags
+        mock_tag = MagicMock()
+        mock_tag.name = "Tips"
+        mock_tag_repo.get_all.return_value = [mock_tag]
+
+        response = no_db_client.post(
+            "/api/ai/suggest-tags",
+            json={
+                "title": "Dockerの使い方",
+                "content": "Docker networking tips",
+                "maxSuggestions": 5,
+            },
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert "suggestions" in data
+        assert len(data["suggestions"]) == 2
+
+        # Check first suggestion (new tag)
+        docker_tag = next((s for s in data["suggestions"] if s["name"] == "Docker"), None)
+        assert docker_tag is not None
+        assert docker_tag["isExisting"] is False
+
+        # Check second suggestion (existing tag)
+        tips_tag = next((s for s in data["suggestions"] if s["name"] == "Tips"), None)
+        assert tips_tag is not None
+        assert tips_tag["isExisting"] is True
+
+    def test_suggest_tags_invalid_json_returns_empty(
+        self,
+        no_db_client: TestClient,
+        mock_ask_service: MagicMock,
+        mock_tag_repo: MagicMock,
+    ) -> None:
         """Test suggest-tags endpoint returns empty list when AI returns invalid JSON."""
-        with (
-            patch("app.api.v1.ai.get_ask_service") as mock_get_service,
-            patch("app.api.v1.ai.get_tag_repo") as mock_get_tag_repo,
-        ):
-            mock_service = MagicMock()
-            mock_service._is_enabled.return_value = True
-
-            # Mock AI returning invalid JSON - parser gracefully handles this
-            mock_service.chat_simple = AsyncMock(return_value=("invalid json", None))
-            mock_get_service.return_value = mock_service
-
-            # Mock existing tags
-            mock_tag_repo = MagicMock()
-            mock_tag_repo.get_all.return_value = []
-            mock_get_tag_repo.return_value = mock_tag_repo
-
-            response = client.post(
-                "/api/ai/suggest-tags",
-                json={"title": "Test", "content": "Test content"},
-            )
+        mock_ask_service._is_enabled.return_value = True
 
-            # Parser gracefully returns empty list for invalid JSON
-            assert response.status_code == 200
-            data = response.json()
-            assert data["suggestions"] == []
+        # Mock AI returning invalid JSON - parser gracefully handles this
+        async def mock_chat_simple(*args, **kwargs):
+            return "invalid json", None
+
+        mock_ask_service.chat_simple = mock_chat_simple
+
+        # Mock existing tags
+        mock_tag_repo.get_all.return_value = []
+
+        response = no_db_client.post(
+            "/api/ai/suggest-tags",
+            json={"title": "Test", "content": "Test content"},
+        )
+
+        # Parser gracefully returns empty list for invalid JSON
+        assert response.status_code == 200
+        data = response.json()
+        assert data["suggestions"] == []
 
 
 class TestAIProjectAskEndpoint:
     """Tests for POST /api/ai/project/ask endpoint."""
 
-    def test_project_ask_when_disabled(self) -> None:
-        """Test project ask endpoint when AI is disabled."""
-        with patch("app.api.v1.ai.get_ask_service") as mock_get_service:
-            mock_service = MagicMock()
-            mock_service._is_enabled.return_value = False
-            mock_get_service.return_value = mock_service
+    def test_project_ask_project_not_found(
+        self,
+        no_db_client: TestClient,
+        mock_ask_service: MagicMock,
+        mock_project_service: MagicMock,
+    ) -> None:
+        """Test project ask endpoint when project not found."""
+        mock_ask_service._is_enabled.return_value = True
 
-            response = client.post(
-                "/api/ai/project/ask",
-                json={"projectId": 1, "question": "What is this project about?"},
-            )
+        # Simulate project not found exception
+        from app.core.errors import NotFoundError
 
-            assert response.status_code == 503
-            assert "not enabled" in response.json()["detail"]
+        mock_project_service.build_prompt_parts.side_effect = NotFoundError(
+            "Project", 999
+        )
 
-    def test_project_ask_project_not_found(self) -> None:
-        """Test project ask endpoint when project not found."""
-        with (
-            patch("app.api.v1.ai.get_ask_service") as mock_get_service,
-            patch("app.api.v1.ai.get_project_service") as mock_get_project_service,
-        ):
-            mock_ask_service = MagicMock()
-            mock_ask_service._is_enabled.return_value = True
-            mock_get_service.return_value = mock_ask_service
-
-            # Simulate project not found exception
-            from app.core.errors import NotFoundError
-
-            mock_project_service = MagicMock()
-            mock_project_service.get_project.side_effect = NotFoundError("Project", 999)
-            mock_get_project_service.return_value = mock_project_service
-
-            response = client.post(
-                "/api/ai/project/ask",
-                json={"projectId": 999, "question": "What is this project about?"},
-            )
+        response = no_db_client.post(
+            "/api/ai/project/ask",
+            json={"projectId": 999, "question": "What is this project about?"},
+        )
 
-            assert response.status_code == 404
+        assert response.status_code == 404
 
-    def test_project_ask_success(self) -> None:
+    def test_project_ask_success(
+        self,
+        no_db_client: TestClient,
+        mock_ask_service: MagicMock,
+        mock_project_service: MagicMock,
+    ) -> None:
         """Test project ask endpoint with successful streaming response."""
-        with (
-            patch("app.api.v1.ai.get_ask_service") as mock_get_service,
-            patch("app.api.v1.ai.get_project_service") as mock_get_project_service,
-        ):
-            mock_ask_service = MagicMock()
-            mock_ask_service._is_enabled.return_value = True
-            mock_get_service.return_value = mock_ask_service
-
-            # Mock project service
-            mock_project_service = MagicMock()
-            mock_project = MagicMock()
-            mock_project.name = "Test Project"
-            mock_project_service.get_project.return_value = mock_project
-            mock_project_service.build_ai_context.return_value = "Project context"
-            mock_get_project_service.return_value = mock_project_service
-
-            # Mock streaming response via stream_chat_response
-            with patch("app.api.v1.ai.stream_chat_response") as mock_stream:
-                async def mock_generator():
-                    yield '{"type": "add_message_token", "token": "Hello"}\n'
-                    yield '{"type": "add_message_token", "token": " World"}\n'
-
-                mock_stream.return_value = mock_generator()
-
-                response = client.post(
-                    "/api/ai/project/ask",
-                    json={"projectId": 1, "question": "What is this project about?"},
-                )
-
-                assert response.status_code == 200
-                assert response.headers["content-type"] == "application/x-ndjson"
+        mock_ask_service._is_enabled.return_value = True
 
+        # Mock project service
+        mock_project_service.build_prompt_parts.return_value = [
+            "Prompt header",
+            "Project context",
+        ]
 
-class TestFileUploadEndpoint:
-    """Tests for POST /api/ai/upload-file endpoint."""
+        # Mock streaming response via stream_chat_response
+        with patch("app.api.v1.ai.stream_chat_response") as mock_stream:
+            async def mock_generator():
+                yield '{"type": "add_message_token", "token": "Hello"}\n'
+                yield '{"type": "add_message_token", "token": " World"}\n'
 
-    def test_upload_when_disabled(self) -> None:
-        """Test upload endpoint when AI is disabled."""
-        with patch("app.api.v1.ai.get_ask_service") as mock_get_service:
-            mock_service = MagicMock()
-            mock_service._is_enabled.return_value = False
-            mock_get_service.return_value = mock_service
+            mock_stream.return_value = mock_generator()
 
-            response = client.post(
-                "/api/ai/upload-file",
-                files={"file": ("test.txt", b"test content", "text/plain")},
-                data={"chat_id": "test-chat-id"},
+            response = no_db_client.post(
+                "/api/ai/project/ask",
+                json={"projectId": 1, "question": "What is this project about?"},
             )
 
-            assert response.status_code == 503
-            assert "not enabled" in response.json()["detail"]
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/x-ndjson"
+
 
-    def test_upload_no_filename(self) -> None:
+class TestFileUploadEndpoint:
+    """Tests for POST /api/ai/upload-file endpoint."""
+
+    def test_upload_no_filename(
+        self,
+        no_db_client: TestClient,
+        mock_ask_service: MagicMock,
+    ) -> None:
         """Test upload endpoint with no filename."""
-        with patch("app.api.v1.ai.get_ask_service") as mock_get_service:
-            mock_service = MagicMock()
-            mock_service._is_enabled.return_value = True
-            mock_get_service.return_value = mock_service
-
-            # Send file with empty filename
-            # FastAPI may return 422 for invalid file
-            response = client.post(
-                "/api/ai/upload-file",
-                files={"file": ("", b"test content", "text/plain")},
-                data={"chat_id": "test-chat-id"},
-            )
+        mock_ask_service._is_enabled.return_value = True
+
+        # Send file with empty filename
+        # FastAPI may return 422 for invalid file
+        response = no_db_client.post(
+            "/api/ai/upload-file",
+            files={"file": ("", b"test content", "text/plain")},
+            data={"chat_id": "test-chat-id"},
+        )
 
-            # Empty filename: validation error (422) or our check (400)
-            assert response.status_code in (400, 422)
+        # Empty filename: validation error (422) or our check (400)
+        assert response.status_code in (400, 422)
 
     @pytest.mark.asyncio
-    async def test_upload_success(self) -> None:
+    async def test_upload_success(
+        self,
+        no_db_client: TestClient,
+        mock_ask_service: MagicMock,
+    ) -> None:
         """Test successful file upload."""
-        with patch("app.api.v1.ai.get_ask_service") as mock_get_service:
-            mock_service = MagicMock()
-            mock_service._is_enabled.return_value = True
-            mock_service.upload_file = AsyncMock(return_value="file-123")
-            mock_get_service.return_value = mock_service
+        mock_ask_service._is_enabled.return_value = True
 
-            response = client.post(
-                "/api/ai/upload-file",
-                files={"file": ("test.txt", b"test content", "text/plain")},
-                data={"chat_id": "test-chat-id"},
-            )
+        async def mock_upload_file(*args, **kwargs):
+            return "file-123"
 
-            assert response.status_code == 200
-            data = response.json()
-            assert data["fileId"] == "file-123"
+        mock_ask_service.upload_file = mock_upload_file
+
+        response = no_db_client.post(
+            "/api/ai/upload-file",
+            files={"file": ("test.txt", b"test content", "text/plain")},
+            data={"chat_id": "test-chat-id"},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["fileId"] == "file-123"
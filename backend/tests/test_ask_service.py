@@ -12,22 +12,13 @@ To run integration tests (requires ASK_API_KEY in .env):
 
 import json
 import os
-from pathlib import Path
 import uuid
+from typing import Callable, Optional
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-# Load .env from project root for integration tests
-_project_root = Path(__file__).parent.parent.parent
-_env_file = _project_root / ".env"
-if _env_file.exists():
-    with open(_env_file) as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith("#") and "=" in line:
-                key, value = line.split("=", 1)
-                os.environ.setdefault(key.strip(), value.strip())
+# .env from the project root is loaded once by conftest.py
 
 # Fallback defaults for unit tests
 os.environ.setdefault("ASK_API_URL", "https://api.example.com")
@@ -52,6 +43,19 @@ from app.services.ask_service import (
     FileUploadError,
 )
 
+# Smallest valid PNG file (1x1), used as a test image
+TINY_PNG = bytes.fromhex(
+    "89504E470D0A1A0A"  # PNG signature
+    "0000000D49484452"  # IHDR chunk
+    "0000000100000001"  # 1x1 dimensions
+    "0802000000907753"  # 8-bit RGB
+    "DE0000000C494441"  # IDAT chunk
+    "5408D763F8FFFF3F"
+    "0005FE02FEDCCC59"
+    "E70000000049454E"  # IEND chunk
+    "44AE426082"
+)
+
 
 # ============================================================================
 # Unit Tests (Mocked HTTP)
@@ -61,9 +65,13 @@ from app.services.ask_service import (
 class TestAskServiceUnit:
     """Unit tests for AskService with mocked HTTP responses."""
 
-    @pytest.fixture
-    def service(self) -> AskService:
-        """Create a service instance for testing."""
+    @pytest.fixture(scope="class")
+    @classmethod
+    def service(cls) -> AskService:
+        """Create a service instance shared by the tests in this class.
+
+        AskService only holds configuration; HTTP calls are mocked per test.
+        """
         return AskService()
 
     @pytest.fixture
@@ -72,11 +80,43 @@ class TestAskServiceUnit:
         with patch("httpx.AsyncClient") as mock:
             yield mock
 
+    @pytest.fixture
+    def mock_client_factory(
+        self, mock_httpx_client: MagicMock
+    ) -> Callable[..., AsyncMock]:
+        """Get a function that makes httpx.AsyncClient answer one response.
+
+        The function takes the status code, an optional JSON payload and
+        text, and the HTTP method to answer, and returns the mock client.
+        """
+
+        def make_client(
+            status_code: int,
+            json_payload: Optional[dict] = None,
+            text: str = "",
+            method: str = "post",
+        ) -> AsyncMock:
+            mock_response = MagicMock()
+            mock_response.status_code = status_code
+            mock_response.json.return_value = json_payload
+            mock_response.text = text
+
+            mock_client = AsyncMock()
+            getattr(mock_client, method).return_value = mock_response
+            mock_client.__aenter__.return_value = mock_client
+            mock_client.__aexit__.return_value = None
+            mock_httpx_client.return_value = mock_client
+            return mock_client
+
+        return make_client
+
     # --- SAS Token Tests ---
 
     @pytest.mark.asyncio
     async def test_get_sas_token_success(
-        self, service: AskService, mock_httpx_client: MagicMock
+        self,
+        service: AskService,
+        mock_client_factory: Callable[..., AsyncMock],
     ) -> None:
         """Test successful SAS token retrieval."""
         # Arrange
@@ -88,15 +128,7 @@ class TestAskServiceUnit:
             "endPoint": "https://stllmdevpub.blob.core.windows.net/",
         }
 
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = expected_response
-
-        mock_client = AsyncMock()
-        mock_client.post.return_value = mock_response
-        mock_client.__aenter__.return_value = mock_client
-        mock_client.__aexit__.return_value = None
-        mock_httpx_client.return_value = mock_client
+        mock_client_factory(200, expected_response)
 
         # Act
         result = await service.get_sas_token("test-chat-id", "image/png")
@@ -114,19 +146,13 @@ class TestAskServiceUnit:
 
     @pytest.mark.asyncio
     async def test_get_sas_token_api_error(
-        self, service: AskService, mock_httpx_client: MagicMock
+        self,
+        service: AskService,
+        mock_client_factory: Callable[..., AsyncMock],
     ) -> None:
         """Test SAS token retrieval with API error."""
         # Arrange
-        mock_response = AsyncMock()
-        mock_response.status_code = 401
-        mock_response.text = "Unauthorized"
-
-        mock_client = AsyncMock()
-        mock_client.post.return_value = mock_response
-        mock_client.__aenter__.return_value = mock_client
-        mock_client.__aexit__.return_value = None
-        mock_httpx_client.return_value = mock_client
+        mock_client_factory(401, text="Unauthorized")
 
         # Act & Assert
         with pytest.raises(AskAPIError) as exc_info:
@@ -139,18 +165,13 @@ class TestAskServiceUnit:
 
     @pytest.mark.asyncio
     async def test_upload_file_to_blob_success(
-        self, service: AskService, mock_httpx_client: MagicMock
+        self,
+        service: AskService,
+        mock_client_factory: Callable[..., AsyncMock],
     ) -> None:
         """Test successful file upload to blob storage."""
         # Arrange
-        mock_response = AsyncMock()
-        mock_response.status_code = 201
-
-        mock_client = AsyncMock()
-        mock_client.put.return_value = mock_response
-        mock_client.__aenter__.return_value = mock_client
-        mock_client.__aexit__.return_value = None
-        mock_httpx_client.return_value = mock_client
+        mock_client = mock_client_factory(201, method="put")
 
         # Act
         await service.upload_file_to_blob(
@@ -164,18 +185,13 @@ class TestAskServiceUnit:
 
     @pytest.mark.asyncio
     async def test_upload_file_to_blob_failure(
-        self, service: AskService, mock_httpx_client: MagicMock
+        self,
+        service: AskService,
+        mock_client_factory: Callable[..., AsyncMock],
     ) -> None:
         """Test file upload failure."""
         # Arrange
-        mock_response = AsyncMock()
-        mock_response.status_code = 403
-
-        mock_client = AsyncMock()
-        mock_client.put.return_value = mock_response
-        mock_client.__aenter__.return_value = mock_client
-        mock_client.__aexit__.return_value = None
-        mock_httpx_client.return_value = mock_client
+        mock_client_factory(403, method="put")
 
         # Act & Assert
         with pytest.raises(FileUploadError):
@@ -189,7 +205,9 @@ class TestAskServiceUnit:
 
     @pytest.mark.asyncio
     async def test_register_chat_file_success(
-        self, service: AskService, mock_httpx_client: MagicMock
+        self,
+        service: AskService,
+        mock_client_factory: Callable[..., AsyncMock],
     ) -> None:
         """Test successful chat file registration."""
         # Arrange
@@ -198,15 +216,7 @@ class TestAskServiceUnit:
             "status": "PROCESSING",
         }
 
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = expected_response
-
-        mock_client = AsyncMock()
-        mock_client.post.return_value = mock_response
-        mock_client.__aenter__.return_value = mock_client
-        mock_client.__aexit__.return_value = None
-        mock_httpx_client.return_value = mock_client
+        mock_client_factory(200, expected_response)
 
         # Act
         result = await service.register_chat_file(
@@ -225,7 +235,9 @@ class TestAskServiceUnit:
 
     @pytest.mark.asyncio
     async def test_check_file_status_done(
-        self, service: AskService, mock_httpx_client: MagicMock
+        self,
+        service: AskService,
+        mock_client_factory: Callable[..., AsyncMock],
     ) -> None:
         """Test file status check when done."""
         # Arrange
@@ -234,15 +246,7 @@ class TestAskServiceUnit:
             "status": "DONE",
         }
 
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = expected_response
-
-        mock_client = AsyncMock()
-        mock_client.get.return_value = mock_response
-        mock_client.__aenter__.return_value = mock_client
-        mock_client.__aexit__.return_value = None
-        mock_httpx_client.return_value = mock_client
+        mock_client_factory(200, expected_response, method="get")
 
         # Act
         result = await service.check_file_status("file-123")
@@ -252,7 +256,9 @@ class TestAskServiceUnit:
 
     @pytest.mark.asyncio
     async def test_check_file_status_error(
-        self, service: AskService, mock_httpx_client: MagicMock
+        self,
+        service: AskService,
+        mock_client_factory: Callable[..., AsyncMock],
     ) -> None:
         """Test file status check when error."""
         # Arrange
@@ -262,15 +268,7 @@ class TestAskServiceUnit:
             "errorMessage": "File format not supported",
         }
 
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = expected_response
-
-        mock_client = AsyncMock()
-        mock_client.get.return_value = mock_response
-        mock_client.__aenter__.return_value = mock_client
-        mock_client.__aexit__.return_value = None
-        mock_httpx_client.return_value = mock_client
+        mock_client_factory(200, expected_response, method="get")
 
         # Act
         result = await service.check_file_status("file-123")
@@ -316,33 +314,47 @@ class TestAskServiceUnit:
 class TestStreamEventParsing:
     """Test parsing of stream events."""
 
-    def test_parse_progress_message(self) -> None:
-        """Test parsing progress message event."""
-        data = {"type": "add_progress_message", "message": "Searching documents..."}
+    @pytest.mark.parametrize(
+        ("data", "field", "expected"),
+        [
+            (
+                {"type": "add_progress_message", "message": "Searching documents..."},
+                "message",
+                "Searching documents...",
+            ),
+            ({"type": "add_message_token", "token": "Hello"}, "token", "Hello"),
+            (
+                {"type": "replace_message", "message": "Full response text"},
+                "message",
+                "Full response text",
+            ),
+            ({"type": "add_bot_message_id", "id": "msg-uuid-123"}, "id", "msg-uuid-123"),
+        ],
+    )
+    def test_parse_event(self, data: dict, field: str, expected: str) -> None:
+        """Test parsing each event type into its field."""
         event = StreamEvent(**data)
-        assert event.type == "add_progress_message"
-        assert event.message == "Searching documents..."
+        assert event.type == data["type"]
+        assert getattr(event, field) == expected
 
-    def test_parse_token_event(self) -> None:
-        """Test parsing token event."""
-        data = {"type": "add_message_token", "token": "Hello"}
-        event = StreamEvent(**data)
-        assert event.type == "add_message_token"
-        assert event.token == "Hello"
 
-    def test_parse_replace_message(self) -> None:
-        """Test parsing replace message event."""
-        data = {"type": "replace_message", "message": "Full response text"}
-        event = StreamEvent(**data)
-        assert event.type == "replace_message"
-        assert event.message == "Full response text"
+class TestStreamedRequestBody:
+    """Test the streamed JSON request body for chunked templates."""
 
-    def test_parse_bot_message_id(self) -> None:
-        """Test parsing bot message ID event."""
-        data = {"type": "add_bot_message_id", "id": "msg-uuid-123"}
-        event = StreamEvent(**data)
-        assert event.type == "add_bot_message_id"
-        assert event.id == "msg-uuid-123"
+    @pytest.mark.asyncio
+    async def test_iter_json_body_is_valid_json(self) -> None:
+        """Test that chunks concatenate into the equivalent JSON payload."""
+        from app.services.ask_service import _iter_json_body
+
+        payload = {"chatId": "abc", "userInput": "質問", "parentId": None}
+        parts = ["前文\n", 'quote " and \\ backslash', "\t末尾"]
+
+        body = b"".join([chunk async for chunk in _iter_json_body(payload, parts)])
+
+        assert json.loads(body.decode("utf-8")) == {
+            **payload,
+            "template": "".join(parts),
+        }
 
 
 # ============================================================================
@@ -362,9 +374,10 @@ class TestAskServiceIntegration:
     Run with: pytest tests/test_ask_service.py -m integration -v
     """
 
-    @pytest.fixture
-    def service(self) -> AskService:
-        """Create a service instance for testing."""
+    @pytest.fixture(scope="class")
+    @classmethod
+    def service(cls) -> AskService:
+        """Create a service instance shared by the tests in this class."""
         service = AskService()
 
         # Skip if not configured
@@ -458,20 +471,6 @@ class TestAskServiceIntegration:
         """
         chat_id = str(uuid.uuid4())
 
-        # Create a simple test image (1x1 PNG)
-        # This is the smallest valid PNG file
-        png_data = bytes([
-            0x89, 0x50, 0x4E, 0x47, 0x0D, 0x0A, 0x1A, 0x0A,  # PNG signature
-            0x00, 0x00, 0x00, 0x0D, 0x49, 0x48, 0x44, 0x52,  # IHDR chunk
-            0x00, 0x00, 0x00, 0x01, 0x00, 0x00, 0x00, 0x01,  # 1x1 dimensions
-            0x08, 0x02, 0x00, 0x00, 0x00, 0x90, 0x77, 0x53,  # 8-bit RGB
-            0xDE, 0x00, 0x00, 0x00, 0x0C, 0x49, 0x44, 0x41,  # IDAT chunk
-            0x54, 0x08, 0xD7, 0x63, 0xF8, 0xFF, 0xFF, 0x3F,
-            0x00, 0x05, 0xFE, 0x02, 0xFE, 0xDC, 0xCC, 0x59,
-            0xE7, 0x00, 0x00, 0x00, 0x00, 0x49, 0x45, 0x4E,  # IEND chunk
-            0x44, 0xAE, 0x42, 0x60, 0x82,
-        ])
-
         try:
             # Step 1: Get SAS token
             sas_response = await service.get_sas_token(chat_id, "image/png")
@@ -480,7 +479,7 @@ class TestAskServiceIntegration:
             # Step 2: Upload to blob
             await service.upload_file_to_blob(
                 sas_response.sas_url,
-                png_data,
+                TINY_PNG,
                 "image/png",
             )
             print("2. Uploaded to blob storage")
@@ -1,6 +1,11 @@
 """Tests for Comments API endpoints."""
+from typing import Callable, Optional
+
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models import Comment
 
 
 class TestCommentsAPI:
@@ -12,6 +17,30 @@ class TestCommentsAPI:
         response = client.post("/api/notes", json=sample_note_data)
         return response.json()["id"]
 
+    @pytest.fixture
+    def add_comments(self, db: Session, note_id: int) -> Callable[..., None]:
+        """Get a function that inserts comments directly in one commit.
+
+        For tests that only need comments to exist, without going through
+        the create endpoint for each one.
+        """
+
+        def add(count: int, parent_id: Optional[int] = None) -> None:
+            db.add_all(
+                [
+                    Comment(
+                        note_id=note_id,
+                        parent_id=parent_id,
+                        display_name="テストユーザー",
+                        content=f"コメント {i + 1}",
+                    )
+                    for i in range(count)
+                ]
+            )
+            db.commit()
+
+        return add
+
     def test_create_comment(
         self, client: TestClient, note_id: int, sample_comment_data: dict
     ) -> None:
@@ -56,14 +85,14 @@ class TestCommentsAPI:
         assert data["content"] == reply_data["content"]
 
     def test_get_comments(
-        self, client: TestClient, note_id: int, sample_comment_data: dict
+        self,
+        client: TestClient,
+        note_id: int,
+        add_comments: Callable[..., None],
     ) -> None:
         """Test getting all comments for a note."""
         # Create multiple comments
-        for i in range(3):
-            data = sample_comment_data.copy()
-            data["content"] = f"コメント {i + 1}"
-            client.post(f"/api/notes/{note_id}/comments", json=data)
+        add_comments(3)
 
         # Get comments
         response = client.get(f"/api/notes/{note_id}/comments")
@@ -74,7 +103,11 @@ class TestCommentsAPI:
         assert len(data) == 3
 
     def test_get_comments_threaded(
-        self, client: TestClient, note_id: int, sample_comment_data: dict
+        self,
+        client: TestClient,
+        note_id: int,
+        sample_comment_data: dict,
+        add_comments: Callable[..., None],
     ) -> None:
         """Test getting comments with thread structure."""
         # Create parent comment
@@ -85,13 +118,7 @@ class TestCommentsAPI:
         parent_id = parent_response.json()["id"]
 
         # Create replies
-        for i in range(2):
-            reply_data = {
-                "content": f"返信 {i + 1}",
-                "display_name": "返信者",
-                "parent_id": parent_id,
-            }
-            client.post(f"/api/notes/{note_id}/comments", json=reply_data)
+        add_comments(2, parent_id)
 
         # Get comments
         response = client.get(f"/api/notes/{note_id}/comments")
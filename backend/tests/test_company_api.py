@@ -1,11 +1,26 @@
 """Tests for Company API endpoints."""
+from typing import Callable
+
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models import Company
 
 
 class TestCompanyAPI:
     """Tests for Company API endpoints."""
 
+    @pytest.fixture
+    def add_companies(self, db: Session) -> Callable[..., None]:
+        """Get a function that inserts companies by name in one commit."""
+
+        def add(*names: str) -> None:
+            db.add_all([Company(name=name) for name in names])
+            db.commit()
+
+        return add
+
     def test_create_company(self, client: TestClient) -> None:
         """Test creating a company via API."""
         response = client.post(
@@ -26,11 +41,12 @@ class TestCompanyAPI:
         )
         assert response.status_code == 400  # Validation error
 
-    def test_get_companies(self, client: TestClient) -> None:
+    def test_get_companies(
+        self, client: TestClient, add_companies: Callable[..., None]
+    ) -> None:
         """Test getting all companies."""
         # Create some companies first
-        client.post("/api/companies", json={"name": "一覧テスト会社A"})
-        client.post("/api/companies", json={"name": "一覧テスト会社B"})
+        add_companies("一覧テスト会社A", "一覧テスト会社B")
 
         response = client.get("/api/companies")
         assert response.status_code == 200
@@ -90,12 +106,12 @@ class TestCompanyAPI:
         get_response = client.get(f"/api/companies/{company_id}")
         assert get_response.status_code == 404
 
-    def test_search_companies(self, client: TestClient) -> None:
+    def test_search_companies(
+        self, client: TestClient, add_companies: Callable[..., None]
+    ) -> None:
         """Test searching companies."""
         # Create companies first
-        client.post("/api/companies", json={"name": "株式会社検索テスト"})
-        client.post("/api/companies", json={"name": "検索テスト商事"})
-        client.post("/api/companies", json={"name": "XYZ株式会社"})
+        add_companies("株式会社検索テスト", "検索テスト商事", "XYZ株式会社")
 
         response = client.get("/api/companies/search?q=検索テスト")
         assert response.status_code == 200
@@ -0,0 +1,180 @@
+"""Tests for the WebSocket ConnectionManager."""
+import asyncio
+import json
+from typing import Any, List
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.websocket.connection_manager import (
+    CURSOR_BROADCAST_INTERVAL,
+    ConnectionManager,
+)
+
+
+def make_websocket() -> MagicMock:
+    """Create a mock WebSocket recording the messages sent to it."""
+    websocket = MagicMock()
+    websocket.accept = AsyncMock()
+    websocket.send_json = AsyncMock()
+    websocket.send_text = AsyncMock()
+    return websocket
+
+
+def sent_messages(websocket: MagicMock) -> List[Any]:
+    """Get the messages broadcast to a mock WebSocket."""
+    return [
+        json.loads(call.args[0]) for call in websocket.send_text.call_args_list
+    ]
+
+
+class TestConnectionManager:
+    """Tests for ConnectionManager."""
+
+    @pytest.mark.asyncio
+    async def test_connect_and_disconnect(self) -> None:
+        """Test that joins and leaves are tracked and announced."""
+        manager = ConnectionManager()
+        ws_a, ws_b = make_websocket(), make_websocket()
+
+        await manager.connect(ws_a, "d1", "a", "Alice", "#FF6B6B")
+        await manager.connect(ws_b, "d1", "b", "Bob", "#4ECDC4")
+
+        assert manager.get_room_count("d1") == 2
+        assert [c["user_id"] for c in manager.get_room_collaborators("d1")] == [
+            "a", "b"
+        ]
+        assert [m["type"] for m in sent_messages(ws_a)] == ["user_joined"]
+
+        await manager.disconnect(ws_b)
+        # Disconnecting twice is a no-op
+        await manager.disconnect(ws_b)
+
+        assert manager.get_room_count("d1") == 1
+        assert [m["type"] for m in sent_messages(ws_a)] == [
+            "user_joined", "user_left"
+        ]
+
+        await manager.disconnect(ws_a)
+        assert manager.get_room_count("d1") == 0
+        assert manager.get_room_collaborators("d1") == []
+
+    @pytest.mark.asyncio
+    async def test_broadcast_drops_failed_connections(self) -> None:
+        """Test that a failing send disconnects only that collaborator."""
+        manager = ConnectionManager()
+        ws_a, ws_b, ws_c = make_websocket(), make_websocket(), make_websocket()
+        await manager.connect(ws_a, "d1", "a", "Alice", "#FF6B6B")
+        await manager.connect(ws_b, "d1", "b", "Bob", "#4ECDC4")
+        await manager.connect(ws_c, "d1", "c", "Carol", "#45B7D1")
+        ws_b.send_text.side_effect = RuntimeError("closed")
+
+        await manager.broadcast_to_room("d1", {"type": "chat"}, exclude=ws_a)
+
+        assert manager.get_room_count("d1") == 2
+        assert {"type": "chat"} in sent_messages(ws_c)
+        assert {"type": "chat"} not in sent_messages(ws_a)
+
+    @pytest.mark.asyncio
+    async def test_broadcast_sends_concurrently(self) -> None:
+        """Test that a slow client does not hold up the others."""
+        manager = ConnectionManager()
+        slow, fast = make_websocket(), make_websocket()
+        await manager.connect(slow, "d1", "s", "Slow", "#FF6B6B")
+        await manager.connect(fast, "d1", "f", "Fast", "#4ECDC4")
+        release = asyncio.Event()
+        received = asyncio.Event()
+
+        async def slow_send(payload: str) -> None:
+            await release.wait()
+
+        async def fast_send(payload: str) -> None:
+            received.set()
+
+        slow.send_text.side_effect = slow_send
+        fast.send_text.side_effect = fast_send
+
+        broadcast = asyncio.create_task(
+            manager.broadcast_to_room("d1", {"type": "chat"})
+        )
+        await asyncio.wait_for(received.wait(), timeout=1)
+        assert not broadcast.done()
+
+        release.set()
+        await broadcast
+        assert manager.get_room_count("d1") == 2
+
+    @pytest.mark.asyncio
+    async def test_broadcast_encodes_once(self) -> None:
+        """Test that every recipient gets the same encoded payload."""
+        manager = ConnectionManager()
+        ws_a, ws_b = make_websocket(), make_websocket()
+        await manager.connect(ws_a, "d1", "a", "Alice", "#FF6B6B")
+        await manager.connect(ws_b, "d1", "b", "Bob", "#4ECDC4")
+        ws_a.send_text.reset_mock()
+
+        await manager.broadcast_to_room("d1", {"type": "chat", "message": "こんにちは"})
+
+        payload_a = ws_a.send_text.call_args.args[0]
+        assert payload_a is ws_b.send_text.call_args.args[0]
+        assert payload_a == '{"type":"chat","message":"こんにちは"}'
+
+    @pytest.mark.asyncio
+    async def test_cursor_moves_are_throttled(self) -> None:
+        """Test that rapid cursor moves are coalesced to the latest one."""
+        manager = ConnectionManager()
+        mover, viewer = make_websocket(), make_websocket()
+        await manager.connect(mover, "d1", "m", "Mover", "#FF6B6B")
+        await manager.connect(viewer, "d1", "v", "Viewer", "#4ECDC4")
+        viewer.send_text.reset_mock()
+
+        for x in range(5):
+            manager.update_cursor(mover, x, 0)
+            await manager.broadcast_cursor(mover)
+        # Only the first move is sent right away
+        assert [m["data"]["x"] for m in sent_messages(viewer)] == [0]
+
+        await asyncio.sleep(CURSOR_BROADCAST_INTERVAL * 2)
+        # The last move follows once the interval has passed
+        assert [m["data"]["x"] for m in sent_messages(viewer)] == [0, 4]
+        assert "cursor_move" not in [m["type"] for m in sent_messages(mover)]
+
+    @pytest.mark.asyncio
+    async def test_disconnect_cancels_pending_cursor(self) -> None:
+        """Test that a leaving user's throttled cursor is not sent."""
+        manager = ConnectionManager()
+        mover, viewer = make_websocket(), make_websocket()
+        await manager.connect(mover, "d1", "m", "Mover", "#FF6B6B")
+        await manager.connect(viewer, "d1", "v", "Viewer", "#4ECDC4")
+
+        await manager.broadcast_cursor(mover)
+        await manager.broadcast_cursor(mover)
+        await manager.disconnect(mover)
+        await asyncio.sleep(CURSOR_BROADCAST_INTERVAL * 2)
+
+        assert [m["type"] for m in sent_messages(viewer)] == [
+            "cursor_move", "user_left"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_room_collaborators_cached_until_change(self) -> None:
+        """Test that the collaborator list is rebuilt only after changes."""
+        manager = ConnectionManager()
+        ws_a, ws_b = make_websocket(), make_websocket()
+        await manager.connect(ws_a, "d1", "a", "Alice", "#FF6B6B")
+
+        first = manager.get_room_collaborators("d1")
+        assert manager.get_room_collaborators("d1") is first
+
+        manager.update_cursor(ws_a, 1.0, 2.0)
+        moved = manager.get_room_collaborators("d1")
+        assert moved is not first
+        assert (moved[0]["cursor_x"], moved[0]["cursor_y"]) == (1.0, 2.0)
+
+        await manager.connect(ws_b, "d1", "b", "Bob", "#4ECDC4")
+        assert len(manager.get_room_collaborators("d1")) == 2
+
+        await manager.disconnect(ws_b)
+        assert [c["user_id"] for c in manager.get_room_collaborators("d1")] == [
+            "a"
+        ]
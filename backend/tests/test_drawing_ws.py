@@ -0,0 +1,34 @@
+"""Tests for the drawing WebSocket endpoint."""
+from fastapi.testclient import TestClient
+
+
+class TestDrawingWebSocket:
+    """Tests for /ws/drawing/{drawing_id}."""
+
+    def test_messages_are_relayed_to_the_room(self, client: TestClient) -> None:
+        """Test that messages are dispatched by type and broadcast."""
+        with client.websocket_connect("/ws/drawing/d1?user_name=Alice") as alice:
+            connected = alice.receive_json()
+            assert connected["type"] == "connected"
+            alice_id = connected["data"]["user_id"]
+
+            with client.websocket_connect("/ws/drawing/d1?user_name=Bob") as bob:
+                assert bob.receive_json()["type"] == "connected"
+                assert alice.receive_json()["type"] == "user_joined"
+
+                # Unknown types are ignored
+                alice.send_json({"type": "unknown"})
+                alice.send_json({"type": ["not", "a", "string"]})
+                alice.send_json({"type": "shape_add", "shape": {"id": "s1"}})
+                message = bob.receive_json()
+                assert message == {
+                    "type": "shape_add",
+                    "data": {
+                        "shape": {"id": "s1"},
+                        "user_id": alice_id,
+                        "user_name": "Alice",
+                    },
+                }
+
+                alice.send_json({"type": "ping"})
+                assert alice.receive_json() == {"type": "pong"}
@@ -11,7 +11,7 @@ class TestExtractProjectLinks:
         """Test extracting a single @P<ID> reference."""
         content = "この案件は @P1 を参照してください"
         result = extract_project_links(content)
-        assert result == [1]
+        assert result == {1}
 
     def test_extract_multiple_project_links(self) -> None:
         """Test extracting multiple @P<ID> references."""
@@ -29,48 +29,48 @@ class TestExtractProjectLinks:
         """Test content with no project links."""
         content = "プロジェクトリンクなし"
         result = extract_project_links(content)
-        assert result == []
+        assert result == set()
 
     def test_ignore_note_links(self) -> None:
         """Test that #<ID> note links are not captured."""
         content = "ノート #1 とプロジェクト @P2"
         result = extract_project_links(content)
-        assert result == [2]
+        assert result == {2}
 
     def test_ignore_email_like_patterns(self) -> None:
         """Test that email-like patterns are not captured."""
         content = "user@P1domain.com には反応しない"
         result = extract_project_links(content)
-        assert result == []
+        assert result == set()
 
     def test_project_link_at_start(self) -> None:
         """Test project link at start of content."""
         content = "@P1 から始まる文"
         result = extract_project_links(content)
-        assert result == [1]
+        assert result == {1}
 
     def test_project_link_at_end(self) -> None:
         """Test project link at end of content."""
         content = "文の終わりに @P99"
         result = extract_project_links(content)
-        assert result == [99]
+        assert result == {99}
 
     def test_project_link_in_parentheses(self) -> None:
         """Test project link inside parentheses."""
         content = "詳細は (@P5) を参照"
         result = extract_project_links(content)
-        assert result == [5]
+        assert result == {5}
 
     def test_empty_content(self) -> None:
         """Test empty content."""
         result = extract_project_links("")
-        assert result == []
+        assert result == set()
 
     def test_ignore_p_without_at(self) -> None:
         """Test that P<ID> without @ is not captured."""
         content = "P1 や P42 は対象外"
         result = extract_project_links(content)
-        assert result == []
+        assert result == set()
 
 
 class TestRenderProjectLinks:
@@ -0,0 +1,29 @@
+"""Tests for summary generation in markdown utility."""
+from app.utils.markdown import generate_summary
+
+
+class TestGenerateSummary:
+    """Tests for generate_summary function."""
+
+    def test_strips_markdown(self) -> None:
+        """Test that formatting is removed from the summary."""
+        content = "## 見出し\n\n**太字**と*斜体*と[リンク](http://example.com)\n\n- 項目"
+        assert generate_summary(content) == "見出し 太字と斜体とリンク 項目"
+
+    def test_long_content_truncated(self) -> None:
+        """Test that long content is cut at a word boundary."""
+        content = "word " * 10000
+        summary = generate_summary(content, max_length=20)
+        assert summary == "word word word word..."
+
+    def test_prefix_cutting_code_block(self) -> None:
+        """Test that a code block cut by the prefix does not leak."""
+        content = "本文 " * 50 + "```\n" + "code " * 1000 + "\n```\n" + "後半 " * 50
+        summary = generate_summary(content, max_length=100)
+        assert "code" not in summary
+        assert "```" not in summary
+
+    def test_short_prefix_falls_back_to_full_content(self) -> None:
+        """Test that text after a long code block is still summarized."""
+        content = "```\n" + "code\n" * 1000 + "```\n" + "後半の本文"
+        assert generate_summary(content, max_length=50) == "後半の本文"
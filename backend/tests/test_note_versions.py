@@ -0,0 +1,153 @@
+"""Tests for note version history."""
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.note_version import NoteVersion
+from app.repositories.note_repo import NoteRepository
+
+
+class TestNoteVersionPruning:
+    """Tests for NoteRepository.prune_versions."""
+
+    def test_prune_versions_keeps_newest(self, db: Session) -> None:
+        """Test that only the newest versions are kept."""
+        repo = NoteRepository(db)
+        note = repo.create(title="バージョンテスト")
+        db.add_all([
+            NoteVersion(
+                note_id=note.id, version_no=no, title=f"v{no}", content_md=""
+            )
+            for no in range(1, 6)
+        ])
+        db.commit()
+
+        repo.prune_versions(note.id, 5, keep=2)
+
+        remaining = db.execute(
+            select(NoteVersion.version_no)
+            .where(NoteVersion.note_id == note.id)
+            .order_by(NoteVersion.version_no)
+        ).scalars().all()
+        assert remaining == [4, 5]
+
+    def test_prune_versions_noop_under_limit(self, db: Session) -> None:
+        """Test that pruning does nothing when under the limit."""
+        repo = NoteRepository(db)
+        note = repo.create(title="バージョンテスト")
+        db.add(NoteVersion(note_id=note.id, version_no=1, title="v1", content_md=""))
+        db.commit()
+
+        repo.prune_versions(note.id, 1, keep=50)
+
+        count = len(db.execute(
+            select(NoteVersion.id).where(NoteVersion.note_id == note.id)
+        ).all())
+        assert count == 1
+
+    def test_prune_versions_other_notes_untouched(self, db: Session) -> None:
+        """Test that pruning one note does not affect another."""
+        repo = NoteRepository(db)
+        note1 = repo.create(title="ノート1")
+        note2 = repo.create(title="ノート2")
+        for note in (note1, note2):
+            db.add_all([
+                NoteVersion(
+                    note_id=note.id, version_no=no, title=f"v{no}", content_md=""
+                )
+                for no in range(1, 4)
+            ])
+        db.commit()
+
+        repo.prune_versions(note1.id, 3, keep=1)
+
+        count = len(db.execute(
+            select(NoteVersion.id).where(NoteVersion.note_id == note2.id)
+        ).all())
+        assert count == 3
+
+    def test_get_max_version_no(self, db: Session) -> None:
+        """Test getting the latest version number."""
+        repo = NoteRepository(db)
+        note = repo.create(title="バージョンテスト")
+        assert repo.get_max_version_no(note.id) == 0
+
+        db.add_all([
+            NoteVersion(note_id=note.id, version_no=no, title="v", content_md="")
+            for no in (1, 2, 7)
+        ])
+        db.commit()
+        assert repo.get_max_version_no(note.id) == 7
+
+
+class TestNoteServiceVersions:
+    """Tests for version creation in NoteService."""
+
+    def test_update_prunes_versions(self, db: Session) -> None:
+        """Test that saving keeps only the newest MAX_VERSIONS versions."""
+        from unittest.mock import patch
+        from app.schemas.note import NoteCreate, NoteUpdate
+        from app.services.note_service import NoteService
+
+        service = NoteService(db)
+        note = service.create_note(NoteCreate(title="v1", content_md=""))
+        with patch("app.services.note_service.MAX_VERSIONS", 2):
+            for i in range(2, 5):
+                service.update_note(note.id, NoteUpdate(title=f"v{i}"))
+
+        remaining = db.execute(
+            select(NoteVersion.version_no, NoteVersion.title)
+            .where(NoteVersion.note_id == note.id)
+            .order_by(NoteVersion.version_no)
+        ).all()
+        assert [tuple(row) for row in remaining] == [(3, "v3"), (4, "v4")]
+
+    def test_get_version_metadata(self, db: Session) -> None:
+        """Test listing version metadata newest first."""
+        from app.schemas.note import NoteCreate, NoteUpdate
+        from app.services.note_service import NoteService
+
+        service = NoteService(db)
+        note = service.create_note(NoteCreate(title="v1", content_md="本文"))
+        service.update_note(note.id, NoteUpdate(title="v2"))
+
+        metadata = service.get_version_metadata(note.id)
+
+        assert [(no, title) for _, no, title, _ in metadata] == [
+            (2, "v2"),
+            (1, "v1"),
+        ]
+
+    def test_get_version(self, db: Session) -> None:
+        """Test getting a single version by number."""
+        import pytest
+        from app.core.errors import NotFoundError
+        from app.schemas.note import NoteCreate, NoteUpdate
+        from app.services.note_service import NoteService
+
+        service = NoteService(db)
+        note = service.create_note(NoteCreate(title="v1", content_md="本文1"))
+        service.update_note(note.id, NoteUpdate(content_md="本文2"))
+
+        version = service.get_version(note.id, 1)
+        assert version.version_no == 1
+        assert version.content_md == "本文1"
+
+        with pytest.raises(NotFoundError):
+            service.get_version(note.id, 99)
+
+    def test_duplicate_note_has_initial_version(self, db: Session) -> None:
+        """Test that a duplicated note starts with a single version 1."""
+        from app.schemas.note import NoteCreate, NoteUpdate
+        from app.services.note_service import NoteService
+
+        service = NoteService(db)
+        note = service.create_note(NoteCreate(title="元", content_md="本文"))
+        service.update_note(note.id, NoteUpdate(content_md="本文2"))
+
+        copy = service.duplicate_note(note.id)
+
+        versions = db.execute(
+            select(NoteVersion.version_no, NoteVersion.content_md)
+            .where(NoteVersion.note_id == copy.id)
+        ).all()
+        assert [tuple(row) for row in versions] == [(1, "本文2")]
@@ -37,6 +37,19 @@ class TestNotesAPI:
         assert "tag2" in tag_names
         assert "tag3" in tag_names
 
+    def test_create_note_with_duplicate_tags(self, client: TestClient) -> None:
+        """Test that duplicate and blank tag names are collapsed."""
+        note_data = {
+            "title": "重複タグノート",
+            "content_md": "",
+            "tag_names": ["tag1", " tag1 ", "", "  ", "tag2", "tag1"],
+        }
+        response = client.post("/api/notes", json=note_data)
+
+        assert response.status_code == 201
+        tag_names = sorted(t["name"] for t in response.json()["tags"])
+        assert tag_names == ["tag1", "tag2"]
+
     def test_get_note(self, client: TestClient, sample_note_data: dict) -> None:
         """Test getting a specific note."""
         # Create a note first
@@ -311,6 +324,24 @@ class TestNoteVersions:
             assert "content_md" in data
             assert "version_no" in data
 
+    def test_restore_version(
+        self, client: TestClient, sample_note_data: dict
+    ) -> None:
+        """Test restoring a note to an earlier version."""
+        create_response = client.post("/api/notes", json=sample_note_data)
+        note_id = create_response.json()["id"]
+        client.put(f"/api/notes/{note_id}", json={"title": "更新", "content_md": "新"})
+
+        response = client.post(f"/api/notes/{note_id}/versions/1/restore")
+
+        assert response.status_code == 200
+        assert response.json()["title"] == sample_note_data["title"]
+        assert response.json()["content_md"] == sample_note_data["content_md"]
+
+        versions = client.get(f"/api/notes/{note_id}/versions").json()
+        assert [v["version_no"] for v in versions] == [3, 2, 1]
+        assert versions[0]["title"] == sample_note_data["title"]
+
 
 class TestNoteExport:
     """Tests for note export endpoints."""
@@ -402,3 +433,171 @@ class TestNoteExport:
         content_disposition = response.headers["content-disposition"]
         # Verify UTF-8 encoded filename is present
         assert "filename*=UTF-8''" in content_disposition
+
+
+class TestEditLockAPI:
+    """Tests for edit lock endpoints."""
+
+    def test_acquire_lock(self, client: TestClient, sample_note_data: dict) -> None:
+        """Test acquiring the edit lock on an unlocked note."""
+        note_id = client.post("/api/notes", json=sample_note_data).json()["id"]
+
+        response = client.post(
+            f"/api/notes/{note_id}/lock", json={"locked_by": "ユーザーA"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True
+        assert data["locked_by"] == "ユーザーA"
+
+    def test_acquire_lock_held_by_other(
+        self, client: TestClient, sample_note_data: dict
+    ) -> None:
+        """Test that another user cannot take a held lock."""
+        note_id = client.post("/api/notes", json=sample_note_data).json()["id"]
+        client.post(f"/api/notes/{note_id}/lock", json={"locked_by": "ユーザーA"})
+
+        response = client.post(
+            f"/api/notes/{note_id}/lock", json={"locked_by": "ユーザーB"}
+        )
+
+        data = response.json()
+        assert data["success"] is False
+        assert data["locked_by"] == "ユーザーA"
+
+    def test_acquire_lock_same_user_and_force(
+        self, client: TestClient, sample_note_data: dict
+    ) -> None:
+        """Test re-acquiring by the holder and forced takeover."""
+        note_id = client.post("/api/notes", json=sample_note_data).json()["id"]
+        client.post(f"/api/notes/{note_id}/lock", json={"locked_by": "ユーザーA"})
+
+        same = client.post(
+            f"/api/notes/{note_id}/lock", json={"locked_by": "ユーザーA"}
+        )
+        forced = client.post(
+            f"/api/notes/{note_id}/lock",
+            json={"locked_by": "ユーザーB", "force": True},
+        )
+
+        assert same.json()["success"] is True
+        assert forced.json()["success"] is True
+        assert forced.json()["locked_by"] == "ユーザーB"
+
+    def test_acquire_lock_retries_after_release(
+        self, client: TestClient, sample_note_data: dict
+    ) -> None:
+        """Test that a lock released during the attempt is taken on retry."""
+        from typing import Any
+        from unittest.mock import patch
+        from app.repositories.note_repo import NoteRepository
+
+        note_id = client.post("/api/notes", json=sample_note_data).json()["id"]
+        real_try_acquire = NoteRepository.try_acquire_lock
+        attempts = []
+
+        def released_after_first_attempt(
+            self: NoteRepository, *args: Any, **kwargs: Any
+        ) -> bool:
+            attempts.append(args)
+            # The first attempt loses to a holder who releases right after
+            if len(attempts) == 1:
+                return False
+            return real_try_acquire(self, *args, **kwargs)
+
+        with patch.object(
+            NoteRepository, "try_acquire_lock", released_after_first_attempt
+        ):
+            response = client.post(
+                f"/api/notes/{note_id}/lock", json={"locked_by": "ユーザーA"}
+            )
+
+        assert len(attempts) == 2
+        assert response.json()["success"] is True
+        assert response.json()["locked_by"] == "ユーザーA"
+
+    def test_acquire_lock_not_found(self, client: TestClient) -> None:
+        """Test acquiring a lock on a non-existent note."""
+        response = client.post("/api/notes/99999/lock", json={"locked_by": "A"})
+        assert response.status_code == 404
+
+    def test_refresh_lock(self, client: TestClient, sample_note_data: dict) -> None:
+        """Test that only the holder can refresh the lock."""
+        note_id = client.post("/api/notes", json=sample_note_data).json()["id"]
+        client.post(f"/api/notes/{note_id}/lock", json={"locked_by": "ユーザーA"})
+
+        owner = client.patch(
+            f"/api/notes/{note_id}/lock/refresh", json={"locked_by": "ユーザーA"}
+        )
+        other = client.patch(
+            f"/api/notes/{note_id}/lock/refresh", json={"locked_by": "ユーザーB"}
+        )
+
+        assert owner.json()["success"] is True
+        assert other.json()["success"] is False
+
+    def test_acquire_expired_lock(
+        self, client: TestClient, db, sample_note_data: dict
+    ) -> None:
+        """Test that an expired lock can be taken by another user."""
+        from datetime import timedelta
+        from app.db.base import now_jst
+        from app.models import Note
+
+        note_id = client.post("/api/notes", json=sample_note_data).json()["id"]
+        note = db.get(Note, note_id)
+        note.editing_locked_by = "ユーザーA"
+        note.editing_locked_at = now_jst() - timedelta(hours=1)
+        db.commit()
+
+        response = client.post(
+            f"/api/notes/{note_id}/lock", json={"locked_by": "ユーザーB"}
+        )
+
+        assert response.json()["success"] is True
+        assert response.json()["locked_by"] == "ユーザーB"
+
+    def test_check_expired_lock_does_not_write(
+        self, client: TestClient, db, sample_note_data: dict
+    ) -> None:
+        """Test that checking an expired lock reports it released read-only."""
+        from datetime import timedelta
+        from app.db.base import now_jst
+        from app.models import Note
+
+        note_id = client.post("/api/notes", json=sample_note_data).json()["id"]
+        note = db.get(Note, note_id)
+        note.editing_locked_by = "ユーザーA"
+        note.editing_locked_at = now_jst() - timedelta(hours=1)
+        db.flush()
+
+        response = client.get(f"/api/notes/{note_id}/lock")
+
+        assert response.json()["is_locked"] is False
+        assert not db.dirty
+        assert note.editing_locked_by == "ユーザーA"
+
+    def test_sweep_expired_locks(
+        self, client: TestClient, db, sample_note_data: dict
+    ) -> None:
+        """Test that the sweep clears only expired locks."""
+        from datetime import timedelta
+        from app.db.base import now_jst
+        from app.models import Note
+        from app.repositories.note_repo import NoteRepository
+
+        expired_id = client.post("/api/notes", json=sample_note_data).json()["id"]
+        active_id = client.post("/api/notes", json=sample_note_data).json()["id"]
+        expired = db.get(Note, expired_id)
+        expired.editing_locked_by = "ユーザーA"
+        expired.editing_locked_at = now_jst() - timedelta(hours=1)
+        client.post(f"/api/notes/{active_id}/lock", json={"locked_by": "ユーザーB"})
+        db.commit()
+
+        released = NoteRepository(db).sweep_expired_locks(30)
+
+        assert released == 1
+        db.expire_all()
+        assert db.get(Note, expired_id).editing_locked_by is None
+        assert db.get(Note, active_id).editing_locked_by == "ユーザーB"
@@ -176,3 +176,80 @@ class TestProjectRepository:
 
         projects = repo.get_projects_without_company()
         assert len(projects) == 2
+
+    def test_list_with_counts(self, db: Session) -> None:
+        """Test listing projects with note and company project counts."""
+        from app.repositories.project_repo import ProjectRepository
+        from app.repositories.company_repo import CompanyRepository
+
+        company = CompanyRepository(db).create(name="集計会社")
+
+        repo = ProjectRepository(db)
+        project_a = repo.create(name="A案件", company_id=company.id)
+        repo.create(name="B案件", company_id=company.id)
+        repo.create(name="C案件")
+
+        db.add_all([
+            Note(title="ノート1", content_md="", project_id=project_a.id),
+            Note(title="ノート2", content_md="", project_id=project_a.id),
+        ])
+        db.commit()
+
+        rows = repo.list_with_counts()
+        by_name = {row[0].name: row for row in rows}
+
+        assert [row[0].name for row in rows] == ["A案件", "B案件", "C案件"]
+        assert by_name["A案件"][1].id == company.id
+        assert by_name["A案件"][2] == 2
+        assert by_name["A案件"][3] == 2
+        assert by_name["B案件"][2] == 0
+        assert by_name["C案件"][1] is None
+        assert by_name["C案件"][2] == 0
+
+    def test_get_note_contents(self, db: Session) -> None:
+        """Test fetching note titles and content, newest first."""
+        from datetime import timedelta
+        from app.repositories.project_repo import ProjectRepository
+        from app.db.base import now_jst
+
+        repo = ProjectRepository(db)
+        project = repo.create(name="コンテキスト")
+        now = now_jst()
+        db.add_all([
+            Note(
+                title="古いノート",
+                content_md="本文1",
+                project_id=project.id,
+                updated_at=now - timedelta(days=2),
+            ),
+            Note(
+                title="新しいノート",
+                content_md="本文2",
+                project_id=project.id,
+                updated_at=now,
+            ),
+            Note(
+                title="中間ノート",
+                content_md="本文3",
+                project_id=project.id,
+                updated_at=now - timedelta(days=1),
+            ),
+            Note(
+                title="削除済み",
+                content_md="",
+                project_id=project.id,
+                updated_at=now,
+                deleted_at=now,
+            ),
+        ])
+        db.commit()
+
+        rows = repo.get_note_contents(project.id, limit=10)
+        assert rows == [
+            ("新しいノート", "本文2"),
+            ("中間ノート", "本文3"),
+            ("古いノート", "本文1"),
+        ]
+        assert repo.get_note_contents(project.id, limit=1) == [
+            ("新しいノート", "本文2")
+        ]
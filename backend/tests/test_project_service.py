@@ -174,6 +174,33 @@ class TestProjectService:
         assert p1.note_count == 1
         assert p2.note_count == 0
 
+    def test_get_project_responses_shares_company(self, db: Session) -> None:
+        """Test that a batch of responses fetches each company once."""
+        from unittest.mock import patch
+        from app.services.project_service import ProjectService
+        from app.services.company_service import CompanyService
+        from app.schemas.company import CompanyCreate
+
+        company_service = CompanyService(db)
+        company = company_service.create_company(CompanyCreate(name="共有会社"))
+
+        service = ProjectService(db)
+        projects = [
+            service.create_project(ProjectCreate(name=name, company_id=company.id))
+            for name in ("案件1", "案件2", "案件3")
+        ]
+
+        with patch.object(
+            service.company_repo,
+            "get_by_id",
+            wraps=service.company_repo.get_by_id,
+        ) as get_by_id:
+            responses = service.get_project_responses(projects)
+
+        assert get_by_id.call_count == 1
+        assert [r.name for r in responses] == ["案件1", "案件2", "案件3"]
+        assert all(r.company.project_count == 3 for r in responses)
+
     def test_get_project_summary(self, db: Session) -> None:
         """Test getting project summary for hover preview."""
         from app.services.project_service import ProjectService
@@ -303,3 +330,62 @@ class TestProjectService:
 
         # Should contain at most 5 notes
         assert "ノート数: 5件" in context
+
+    def test_build_ai_context_cached(self, db: Session) -> None:
+        """Test that unchanged projects reuse the cached context."""
+        from unittest.mock import patch
+        from app.services.project_service import ProjectService
+
+        service = ProjectService(db)
+        project = service.create_project(ProjectCreate(name="キャッシュテスト"))
+        db.add(Note(title="ノート", content_md="内容", project_id=project.id))
+        db.commit()
+
+        first = service.build_ai_context(project.id)
+        with patch.object(
+            service.project_repo,
+            "get_note_contents",
+            wraps=service.project_repo.get_note_contents,
+        ) as get_note_contents:
+            second = service.build_ai_context(project.id)
+
+        assert second == first
+        get_note_contents.assert_not_called()
+
+    def test_build_ai_context_cache_invalidated_on_change(
+        self, db: Session
+    ) -> None:
+        """Test that adding a note invalidates the cached context."""
+        from app.services.project_service import ProjectService
+
+        service = ProjectService(db)
+        project = service.create_project(ProjectCreate(name="無効化テスト"))
+        db.add(Note(title="ノート1", content_md="内容1", project_id=project.id))
+        db.commit()
+        service.build_ai_context(project.id)
+
+        db.add(Note(title="ノート2", content_md="内容2", project_id=project.id))
+        db.commit()
+        context = service.build_ai_context(project.id)
+
+        assert "ノート2" in context
+        assert "ノート数: 2件" in context
+
+    def test_build_prompt_parts(self, db: Session) -> None:
+        """Test that the prompt is the header followed by the context."""
+        from app.services.project_service import (
+            PROJECT_ASK_PROMPT_HEADER,
+            ProjectService,
+        )
+
+        service = ProjectService(db)
+        project = service.create_project(ProjectCreate(name="プロンプトテスト"))
+        db.add(Note(title="ノート", content_md="内容", project_id=project.id))
+        db.commit()
+
+        parts = service.build_prompt_parts(project.id)
+
+        assert parts[0] == PROJECT_ASK_PROMPT_HEADER.format(
+            project_name="プロンプトテスト"
+        )
+        assert "".join(parts[1:]) == service.build_ai_context(project.id)
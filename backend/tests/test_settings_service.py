@@ -0,0 +1,119 @@
+"""Tests for SettingsService."""
+from typing import Generator, List
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.schemas.settings import SettingsUpdate
+
+
+@pytest.fixture
+def selects(db: Session) -> Generator[List[str], None, None]:
+    """Record SELECT statements executed on the session's engine."""
+    statements: List[str] = []
+    engine = db.get_bind()
+
+    def listener(conn, cursor, statement, *args) -> None:
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", listener)
+    yield statements
+    event.remove(engine, "before_cursor_execute", listener)
+
+
+class TestSettingsService:
+    """Tests for SettingsService."""
+
+    def test_get_all_settings_defaults(self, db: Session) -> None:
+        """Test defaults when no settings are stored."""
+        from app.services.settings_service import (
+            DEFAULT_AI_MODEL,
+            SettingsService,
+        )
+
+        settings = SettingsService(db).get_all_settings()
+
+        assert settings.discord_notification_enabled is False
+        assert settings.discord_notify_on_create is True
+        assert settings.discord_notify_on_update is True
+        assert settings.discord_notify_on_comment is True
+        assert settings.ai_model == DEFAULT_AI_MODEL
+
+    def test_get_all_settings_single_query(
+        self, db: Session, selects: List[str]
+    ) -> None:
+        """Test that all settings are loaded with one query."""
+        from app.services.settings_service import SettingsService
+
+        service = SettingsService(db)
+        service.get_all_settings()
+        service.is_discord_notify_on_create_enabled()
+        service.get_ai_model()
+
+        assert len(selects) == 1
+
+    def test_update_settings_invalidates_cache(self, db: Session) -> None:
+        """Test that updated values are visible to the same service."""
+        from app.services.settings_service import SettingsService
+
+        service = SettingsService(db)
+        assert service.is_discord_notification_enabled() is False
+
+        settings = service.update_settings(
+            SettingsUpdate(
+                discord_notification_enabled=True,
+                discord_notify_on_comment=False,
+                ai_model="test-model",
+            )
+        )
+
+        assert settings.discord_notification_enabled is True
+        assert settings.discord_notify_on_comment is False
+        assert settings.ai_model == "test-model"
+        assert service.is_discord_notify_on_comment_enabled() is False
+        assert service.is_discord_notify_on_create_enabled() is True
+
+    def test_settings_shared_across_instances(
+        self, db: Session, selects: List[str]
+    ) -> None:
+        """Test that new service instances reuse the cached settings."""
+        from app.services.settings_service import SettingsService
+
+        SettingsService(db).get_all_settings()
+        SettingsService(db).is_discord_notify_on_update_enabled()
+
+        assert len(selects) == 1
+
+    def test_update_invalidates_other_instances(self, db: Session) -> None:
+        """Test that a write is visible to services created afterwards."""
+        from app.services.settings_service import SettingsService
+
+        assert SettingsService(db).get_ai_model() != "other-model"
+
+        SettingsService(db).update_settings(SettingsUpdate(ai_model="other-model"))
+
+        assert SettingsService(db).get_ai_model() == "other-model"
+
+    def test_update_settings_commits_once(self, db: Session) -> None:
+        """Test that new and existing settings are saved in one commit."""
+        from unittest.mock import patch
+        from app.services.settings_service import SettingsService
+
+        service = SettingsService(db)
+        service.update_settings(SettingsUpdate(discord_notify_on_create=False))
+
+        with patch.object(db, "commit", wraps=db.commit) as commit:
+            settings = service.update_settings(
+                SettingsUpdate(
+                    discord_notification_enabled=True,
+                    discord_notify_on_create=True,
+                    discord_notify_on_update=False,
+                )
+            )
+
+        assert commit.call_count == 1
+        assert settings.discord_notification_enabled is True
+        assert settings.discord_notify_on_create is True
+        assert settings.discord_notify_on_update is False
@@ -0,0 +1,30 @@
+"""Tests for TagRepository."""
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import Tag
+
+
+class TestTagRepository:
+    """Tests for TagRepository."""
+
+    def test_get_or_create_many(self, db: Session) -> None:
+        """Test that existing tags are reused and missing ones created."""
+        from app.repositories.tag_repo import TagRepository
+
+        repo = TagRepository(db)
+        existing = repo.get_or_create("既存")
+
+        tags = repo.get_or_create_many(["新規1", "既存", " 新規2 ", "新規1", ""])
+
+        assert [t.name for t in tags] == ["新規1", "既存", "新規2"]
+        assert tags[1].id == existing.id
+        names = db.execute(select(Tag.name).order_by(Tag.name)).scalars().all()
+        assert sorted(names) == sorted(["既存", "新規1", "新規2"])
+
+    def test_get_or_create_many_empty(self, db: Session) -> None:
+        """Test that blank names produce no tags."""
+        from app.repositories.tag_repo import TagRepository
+
+        repo = TagRepository(db)
+        assert repo.get_or_create_many(["", "  "]) == []
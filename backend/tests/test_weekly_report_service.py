@@ -0,0 +1,301 @@
+"""Tests for WeeklyReportService."""
+from sqlalchemy.orm import Session
+
+from app.models.note import Note
+
+
+class TestWeeklyReportService:
+    """Tests for WeeklyReportService."""
+
+    def test_get_linked_note_contents(self, db: Session) -> None:
+        """Test that linked notes are fetched and formatted."""
+        from app.db.base import now_jst
+        from app.services.weekly_report_service import WeeklyReportService
+
+        short = Note(title="短いノート", content_md="本文")
+        long = Note(title="長いノート", content_md="あ" * 1500)
+        deleted = Note(title="削除済み", content_md="x", deleted_at=now_jst())
+        db.add_all([short, long, deleted])
+        db.commit()
+
+        contents = WeeklyReportService(db).get_linked_note_contents(
+            [short.id, long.id, deleted.id, 99999]
+        )
+
+        assert set(contents) == {short.id, long.id}
+        assert contents[short.id] == f"### 参照: #{short.id} 短いノート\n本文"
+        assert contents[long.id].endswith("あ" * 1000 + "...")
+
+    def test_get_linked_note_contents_empty(self, db: Session) -> None:
+        """Test that no IDs yields no contents."""
+        from app.services.weekly_report_service import WeeklyReportService
+
+        assert WeeklyReportService(db).get_linked_note_contents([]) == {}
+
+    def test_get_linked_note_contents_uses_prefetched(
+        self, db: Session
+    ) -> None:
+        """Test that prefetched notes are not queried again."""
+        from sqlalchemy import event
+        from app.services.weekly_report_service import WeeklyReportService
+
+        loaded = Note(title="読込済み", content_md="a")
+        other = Note(title="未読込", content_md="b")
+        db.add_all([loaded, other])
+        db.commit()
+        db.refresh(loaded)
+        loaded_id, other_id = loaded.id, other.id
+        service = WeeklyReportService(db)
+
+        statements = []
+        engine = db.get_bind()
+
+        def listener(conn, cursor, statement, *args) -> None:
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            contents = service.get_linked_note_contents(
+                [loaded_id, other_id], prefetched={loaded_id: loaded}
+            )
+            only_prefetched = service.get_linked_note_contents(
+                [loaded_id], prefetched={loaded_id: loaded}
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        assert set(contents) == {loaded_id, other_id}
+        assert set(only_prefetched) == {loaded_id}
+        # Only the note that was not prefetched is queried
+        assert len(statements) == 1
+
+    def test_run_aggregation(self, db: Session) -> None:
+        """Test aggregating reports into new and existing achievement notes."""
+        import asyncio
+        from unittest.mock import AsyncMock, MagicMock, patch
+        from app.models.folder import Folder
+        from app.models.project import Project
+        from app.services.weekly_report_service import WeeklyReportService
+
+        folder = Folder(name="週報")
+        project_a = Project(name="案件A")
+        project_b = Project(name="案件B")
+        db.add_all([folder, project_a, project_b])
+        db.commit()
+        existing = Note(
+            title="案件B 週報実績",
+            content_md="# 週報実績\n\n前回",
+            project_id=project_b.id,
+        )
+        db.add(existing)
+        db.add(Note(
+            title="2025/01/06 週報",
+            content_md=(
+                f"## @P{project_a.id}\n- A作業\n"
+                f"## @P{project_b.id}\n- B作業\n"
+            ),
+            folder_id=folder.id,
+            created_by="taro",
+        ))
+        db.commit()
+
+        ask_service = MagicMock()
+        ask_service.chat_simple = AsyncMock(return_value=("要約", None))
+        with patch(
+            "app.services.weekly_report_service.get_ask_service",
+            return_value=ask_service,
+        ) as mock_get_service:
+            result = asyncio.run(WeeklyReportService(db).run_aggregation())
+
+        mock_get_service.assert_called_once()
+        assert result.errors == []
+        assert result.processed_notes == 1
+        assert result.projects_updated == 2
+        assert result.achievement_notes_created == 1
+
+        db.refresh(existing)
+        assert "要約" in existing.content_md
+        assert existing.content_md.endswith("前回")
+        titles = [n.title for n in db.query(Note).filter_by(project_id=project_a.id)]
+        assert titles == ["案件A 週報実績"]
+
+    def test_group_sections_by_project(self, db: Session) -> None:
+        """Test grouping sections by project ID and by names."""
+        from app.models.company import Company
+        from app.models.project import Project
+        from app.services.weekly_report_service import WeeklyReportService
+        from app.utils.weekly_report_parser import ProjectSection
+
+        company = Company(name="会社")
+        db.add(company)
+        db.commit()
+        by_name = Project(name="名前案件", company_id=company.id)
+        by_id = Project(name="ID案件")
+        fallback = Project(name="別会社の案件")
+        db.add_all([by_name, by_id, fallback])
+        db.commit()
+
+        sections = [
+            ProjectSection("", "", "1", project_id=by_id.id),
+            ProjectSection("会社", "名前案件", "2"),
+            ProjectSection("会社", "名前案件", "3"),
+            ProjectSection("不明会社", "別会社の案件", "4"),
+            ProjectSection("会社", "存在しない", "5"),
+            ProjectSection("", "", "6", project_id=99999),
+        ]
+
+        grouped = WeeklyReportService(db).group_sections_by_project(sections)
+
+        assert {
+            project_id: [s.content for s in group]
+            for project_id, group in grouped.items()
+        } == {
+            by_id.id: ["1"],
+            by_name.id: ["2", "3"],
+            fallback.id: ["4"],
+        }
+
+    def _add_report(self, db: Session, count: int) -> list:
+        """Add a weekly report folder and a report covering count projects."""
+        from app.models.folder import Folder
+        from app.models.project import Project
+
+        folder = Folder(name="週報")
+        projects = [Project(name=f"案件{i}") for i in range(count)]
+        db.add_all([folder, *projects])
+        db.commit()
+        content = "".join(
+            f"## @P{project.id}\n- 作業{i}\n" for i, project in enumerate(projects)
+        )
+        db.add(Note(title="週報", content_md=content, folder_id=folder.id))
+        db.commit()
+        return projects
+
+    def test_run_aggregation_summarizes_concurrently(self, db: Session) -> None:
+        """Test that summaries run concurrently up to the limit."""
+        import asyncio
+        from unittest.mock import MagicMock, patch
+        from app.services.weekly_report_service import WeeklyReportService
+
+        self._add_report(db, 5)
+        running = 0
+        peak = 0
+
+        async def chat_simple(**kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return "要約", None
+
+        ask_service = MagicMock()
+        ask_service.chat_simple = chat_simple
+        with (
+            patch(
+                "app.services.weekly_report_service.get_ask_service",
+                return_value=ask_service,
+            ),
+            patch("app.services.weekly_report_service.SUMMARY_CONCURRENCY", 2),
+        ):
+            result = asyncio.run(WeeklyReportService(db).run_aggregation())
+
+        assert result.projects_updated == 5
+        assert peak == 2
+
+    def test_run_aggregation_failure_isolated(self, db: Session) -> None:
+        """Test that one failed summary does not stop other projects."""
+        import asyncio
+        from unittest.mock import MagicMock, patch
+        from app.services.weekly_report_service import WeeklyReportService
+
+        projects = self._add_report(db, 2)
+        failing_id = projects[0].id
+
+        async def chat_simple(user_input: str, **kwargs):
+            if "作業0" in user_input:
+                raise RuntimeError("boom")
+            return "要約", None
+
+        ask_service = MagicMock()
+        ask_service.chat_simple = chat_simple
+        with patch(
+            "app.services.weekly_report_service.get_ask_service",
+            return_value=ask_service,
+        ):
+            result = asyncio.run(WeeklyReportService(db).run_aggregation())
+
+        assert result.projects_updated == 1
+        assert result.errors == [f"Failed to process project {failing_id}: boom"]
+
+    def test_find_weekly_report_folder_ids(self, db: Session) -> None:
+        """Test collecting all folders under weekly report roots."""
+        from app.models.folder import Folder
+        from app.services.weekly_report_service import WeeklyReportService
+
+        root1 = Folder(name="週報")
+        root2 = Folder(name="2025年 週報")
+        other = Folder(name="議事録")
+        db.add_all([root1, root2, other])
+        db.commit()
+        child = Folder(name="1月", parent_id=root1.id)
+        other_child = Folder(name="1月", parent_id=other.id)
+        db.add_all([child, other_child])
+        db.commit()
+        grandchild = Folder(name="第1週", parent_id=child.id)
+        db.add(grandchild)
+        db.commit()
+
+        folder_ids = WeeklyReportService(db).find_weekly_report_folder_ids()
+
+        assert sorted(folder_ids) == sorted(
+            [root1.id, root2.id, child.id, grandchild.id]
+        )
+
+    def test_summarize_project_includes_linked_notes(self, db: Session) -> None:
+        """Test the text sent for summarization."""
+        import asyncio
+        from unittest.mock import AsyncMock, MagicMock, patch
+        from app.models.project import Project
+        from app.services.weekly_report_service import WeeklyReportService
+        from app.utils.weekly_report_parser import ProjectSection
+
+        sections = [
+            ProjectSection("", "", "- 作業A", author="taro", note_links=[1, 2]),
+            ProjectSection("", "", "- 作業B"),
+        ]
+        ask_service = MagicMock()
+        ask_service.chat_simple = AsyncMock(return_value=("要約", None))
+        with patch(
+            "app.services.weekly_report_service.get_ask_service",
+            return_value=ask_service,
+        ):
+            summary = asyncio.run(WeeklyReportService(db).summarize_project(
+                Project(name="案件"), sections, {1: "リンク1"}
+            ))
+
+        assert summary == "要約"
+        assert ask_service.chat_simple.call_args.kwargs["user_input"] == (
+            "### taro の報告\n- 作業A\n\nリンク1"
+            "\n\n---\n\n"
+            "### 不明 の報告\n- 作業B"
+        )
+
+    def test_prepend_summary_to_note(self, db: Session) -> None:
+        """Test that the summary goes right after the header."""
+        from unittest.mock import patch
+        from app.services.weekly_report_service import WeeklyReportService
+
+        with_header = Note(title="A", content_md="# 週報実績\n\n前回")
+        without_header = Note(title="B", content_md="本文")
+        db.add_all([with_header, without_header])
+        db.commit()
+
+        service = WeeklyReportService(db)
+        with patch.object(service, "get_week_label", return_value="第1週"):
+            service.prepend_summary_to_note(with_header, "要約")
+            service.prepend_summary_to_note(without_header, "要約")
+
+        entry = "# 週報実績\n\n## 第1週\n\n要約\n\n---\n\n"
+        assert with_header.content_md == entry + "前回"
+        assert without_header.content_md == entry + "本文"